@@ -0,0 +1,73 @@
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent.parent / ".cache" / "answers"
+# solution modules can import shared code, changes to it invalidate answers too
+SHARED_SOURCES = [Path(__file__).parent / "util.py"]
+
+
+def file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class AnswerCache:
+    """On-disk cache of answers keyed by day, part, input and solution code.
+
+    Every answer is a small pickle file named by the hash of its key.
+    Reading an entry bumps its modification time, so when there are more
+    than max_entries files the least recently used ones are removed.
+    """
+
+    def __init__(self, folder=CACHE_DIR, max_entries=1024):
+        self.folder = Path(folder)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.shared_sha256 = "".join(
+            file_sha256(path) for path in SHARED_SOURCES if path.exists()
+        )
+
+    def key(self, solution, day, part, input_sha256: str):
+        source_sha256 = file_sha256(solution.__file__) + self.shared_sha256
+        return f"day{day}|part{part}|{input_sha256}|{source_sha256}"
+
+    def path(self, key):
+        return self.folder / (hashlib.sha256(key.encode()).hexdigest() + ".pickle")
+
+    def get(self, key):
+        """Return (True, answer) on a hit and (False, None) on a miss"""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                stored_key, answer = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            stored_key = None
+        if stored_key != key:
+            self.misses += 1
+            return False, None
+        os.utime(path)
+        self.hits += 1
+        return True, answer
+
+    def put(self, key, answer):
+        self.folder.mkdir(parents=True, exist_ok=True)
+        path = self.path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump((key, answer), f)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        entries = list(self.folder.glob("*.pickle"))
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda path: path.stat().st_mtime)
+        for path in entries[: len(entries) - self.max_entries]:
+            path.unlink(missing_ok=True)
+
+    def stats_str(self):
+        return f"Cache: {self.hits} hits, {self.misses} misses"
@@ -0,0 +1,190 @@
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from runner import input_sha256, part_steps
+
+
+def time_part(solve, content, repeats=5, warmup=1):
+    """Run solve(content) warmup + repeats times, return answer and timed runs"""
+    for _ in range(warmup):
+        solve(content)
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        answer = solve(content)
+        times.append(time.perf_counter() - t0)
+    return answer, times
+
+
+def bench_day(day, input_path, repeats=5, warmup=1):
+    """Time both parts of a day, return a list of per-run records
+
+    Days with a parse hook get it timed as well and reported as part 0.
+    Parts with a streaming version are timed reading from the file.
+    """
+    solution = __import__(f"day{day}")
+    steps = part_steps(solution, input_path)
+    records = []
+    for part, solve, arg in steps:
+        answer, times = time_part(solve, arg, repeats=repeats, warmup=warmup)
+        if part == 0:
+            answer = ""
+        records.extend(
+            dict(
+                day=day,
+                title=solution.day_title,
+                part=part,
+                answer=str(answer),
+                run=run,
+                seconds=seconds,
+            )
+            for run, seconds in enumerate(times)
+        )
+    return records
+
+
+def summarize(records):
+    """Aggregate per-run records into min/median/p95/std per day and part"""
+    import pandas as pd
+
+    runs = pd.DataFrame.from_records(records)
+    grouped = runs.groupby(["day", "title", "part", "answer"], sort=True)["seconds"]
+    stats = grouped.agg(
+        min="min",
+        median="median",
+        p95=lambda s: s.quantile(0.95),
+        std=lambda s: s.std(ddof=0),
+        runs="count",
+    )
+    return stats.reset_index()
+
+
+def print_stats(stats):
+    for (day, title), rows in stats.groupby(["day", "title"], sort=True):
+        print(f"--- Day {day}: {title} ---")
+        for row in rows.itertuples():
+            label = "Parse:" if row.part == 0 else f"Part {row.part}: {row.answer}"
+            print(
+                f"{label} "
+                f"(min {row.min:.4f} s, median {row.median:.4f} s, "
+                f"p95 {row.p95:.4f} s, std {row.std:.4f} s, n={row.runs})"
+            )
+
+
+def save_stats(stats, path):
+    """Write stats table to csv or parquet depending on file extension"""
+    if str(path).endswith(".parquet"):
+        stats.to_parquet(path, index=False)
+    else:
+        stats.to_csv(path, index=False)
+
+
+def measurements(inputs, timings):
+    """Attach baseline keys to timings given as {(day, part): seconds}"""
+    hashes = {day: input_sha256(path) for day, path in inputs.items()}
+    python = platform.python_version()
+    return [
+        dict(
+            day=day,
+            part=part,
+            input_sha256=hashes[day],
+            python=python,
+            seconds=seconds,
+        )
+        for (day, part), seconds in sorted(timings.items())
+    ]
+
+
+def baseline_key(m):
+    return f"day{m['day']}|part{m['part']}|{m['input_sha256']}|{m['python']}"
+
+
+def load_baseline(path):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, current):
+    """Add measurements to the baseline file, replacing ones with the same key"""
+    baseline = load_baseline(path)
+    for m in current:
+        baseline[baseline_key(m)] = m
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def compare_to_baseline(path, current, threshold=0.2, min_seconds=0.005):
+    """Print comparison with the baseline, return the list of regressions.
+
+    A part regresses if it got slower than baseline by more than threshold
+    (as a fraction). Parts faster than min_seconds both before and after
+    are too noisy to judge and are never flagged.
+    """
+    baseline = load_baseline(path)
+    regressions = []
+    for m in current:
+        part = "parse" if m["part"] == 0 else f"part {m['part']}"
+        label = f"Day {m['day']} {part}"
+        base = baseline.get(baseline_key(m))
+        if base is None:
+            print(f"{label}: {m['seconds']:.3f} s (no baseline)")
+            continue
+        before, after = base["seconds"], m["seconds"]
+        change = (after - before) / before if before > 0 else 0
+        status = ""
+        if after > before * (1 + threshold) and max(before, after) >= min_seconds:
+            status = "  <-- REGRESSION"
+            regressions.append(m)
+        print(f"{label}: {before:.3f} s -> {after:.3f} s ({change:+.0%}){status}")
+    return regressions
+
+
+def import_times(day):
+    """Import a day module in a fresh interpreter with -X importtime.
+
+    Returns total import time of the module and times of its direct imports
+    in microseconds. Modules loaded at interpreter startup are not counted.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import day{day}"],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    children = {}
+    # -X importtime lists a module after everything it imported,
+    # so direct imports of dayN are the level 1 lines preceding it
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isnumeric():
+            continue  # header line
+        # nesting level is shown by two extra spaces per level
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if level == 1:
+            children[name] = int(cumulative)
+        elif level == 0:
+            if name == f"day{day}":
+                total = int(cumulative)
+                break
+            children = {}
+    return total, children
+
+
+def print_import_times(days, top=5):
+    for day in days:
+        total, children = import_times(day)
+        print(f"--- Day {day}: import day{day} {total / 1000:.1f} ms ---")
+        heaviest = sorted(children.items(), key=lambda x: x[1], reverse=True)
+        for name, us in heaviest[:top]:
+            print(f"{us / 1000:8.1f} ms  {name}")
@@ -1,24 +1,34 @@
 # Day 1: Calorie Counting
 # Problem statement: https://adventofcode.com/2022/day/1
 
+import heapq
+
 day_title = "Calorie Counting"
 
 
+def elf_calories(lines):
+    """Total calories carried by each elf, elfs are separated by blank lines"""
+    calories = 0
+    for line in lines:
+        if line.strip() == "":
+            yield calories
+            calories = 0
+        else:
+            calories += int(line)
+    yield calories
+
+
+def part1_stream(lines):
+    return max(elf_calories(lines))
+
+
+def part2_stream(lines):
+    return sum(heapq.nlargest(3, elf_calories(lines)))
+
+
 def part1(text_input):
-    max_calories = 0
-    elfs = text_input.strip().split("\n\n")
-    for elf in elfs:
-        calories = sum(map(int, elf.split()))
-        max_calories = max(calories, max_calories)
-    return max_calories
+    return part1_stream(text_input.strip().split("\n"))
 
 
 def part2(text_input):
-    top3 = [0, 0, 0]
-    elfs = text_input.strip().split("\n\n")
-    for elf in elfs:
-        calories = sum(map(int, elf.split()))
-        if calories > top3[0]:
-            top3.append(calories)
-            top3 = sorted(top3)[-3:]
-    return sum(top3)
+    return part2_stream(text_input.strip().split("\n"))
@@ -1,18 +1,15 @@
 # Day 10: Cathode-Ray Tube
 # Problem statement: https://adventofcode.com/2022/day/10
 
+from itertools import islice
 from pathlib import Path
-from matplotlib import pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.patches import Rectangle
-from matplotlib import transforms
 import numpy as np
 
 day_title = "Cathode-Ray Tube"
 
 
-def command_iter(text_input: str):
-    for line in text_input.split("\n"):
+def command_iter(lines):
+    for line in lines:
         command, *args = line.split()
         if command == "noop":
             yield command, None
@@ -20,28 +17,33 @@ def command_iter(text_input: str):
             yield command, int(args[0])
 
 
-def get_x_values(text_input: str):
-    x = []
+def x_values_iter(lines):
+    """Value of X during each cycle"""
     current = 1
-    for command, arg in command_iter(text_input):
+    for command, arg in command_iter(lines):
         if command == "noop":
-            x.append(current)
+            yield current
         elif command == "addx":
-            x.extend((current, current))
+            yield current
+            yield current
             current += arg
-    return x
 
 
-def part1(text_input):
-    x = get_x_values(text_input)
+def get_x_values(text_input: str):
+    return list(x_values_iter(text_input.split("\n")))
+
+
+parse = get_x_values
+
+
+def part1(x):
     total = 0
     for i in range(20, 260, 40):
         total += x[i - 1] * i
     return total
 
 
-def part2(text_input):
-    x = get_x_values(text_input)
+def part2(x):
     lines = []
     W, H = 40, 6
     for h in range(H):
@@ -56,7 +58,21 @@ def part2(text_input):
     return "\n" + "\n".join(lines)
 
 
+def part1_stream(lines):
+    # only the first 240 cycles are ever needed
+    return part1(list(islice(x_values_iter(lines), 240)))
+
+
+def part2_stream(lines):
+    return part2(list(islice(x_values_iter(lines), 240)))
+
+
 def visualize(text_input: str):
+    from matplotlib import pyplot as plt
+    import matplotlib.animation as animation
+    from matplotlib.patches import Rectangle
+    from matplotlib import transforms
+
     fig, ax = plt.subplots(figsize=(8, 6), facecolor="#444")
     ax.axis("off")
     W, H = 40, 6
@@ -44,8 +44,12 @@ def inspect(monkey: Monkey, item: int):
     return op(num1, num2)
 
 
-def part1(text_input):
-    monkeys = parse_monkeys(text_input)
+parse = parse_monkeys
+
+
+def part1(monkeys):
+    # items get passed around so work on a copy
+    monkeys = [monkey._replace(items=list(monkey.items)) for monkey in monkeys]
     inspections = [0] * len(monkeys)
     for r in range(20):
         for monkey in monkeys:
@@ -61,8 +65,8 @@ def part1(text_input):
     return inspections[0] * inspections[1]
 
 
-def part2(text_input):
-    monkeys = parse_monkeys(text_input)
+def part2(monkeys):
+    monkeys = [monkey._replace(items=list(monkey.items)) for monkey in monkeys]
     inspections = [0] * len(monkeys)
     divide_by = 1
     for monkey in monkeys:
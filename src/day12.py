@@ -5,10 +5,6 @@ import math
 from collections import namedtuple
 import heapq
 from pathlib import Path
-from matplotlib import pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.patches import Circle
-from matplotlib import transforms
 
 day_title = "Hill Climbing Algorithm"
 
@@ -42,10 +38,13 @@ def parse_heights(text_input):
     return heights, start, finish
 
 
+parse = parse_heights
+
+
 class Hills:
-    def __init__(self, text_input):
+    def __init__(self, parsed_heights):
         # switch start and finish because search is faster this way for the tasks
-        self.heights, self.finish, self.start = parse_heights(text_input)
+        self.heights, self.finish, self.start = parsed_heights
         self.min_steps = {}
 
     def next_states(self, state: State):
@@ -93,8 +92,8 @@ def search_1(hills: Hills, yield_search_states=False):
     yield bestpath
 
 
-def part1(text_input: str):
-    hills = Hills(text_input)
+def part1(parsed_heights):
+    hills = Hills(parsed_heights)
     bestpath = next(search_1(hills))
     return len(bestpath)
 
@@ -123,8 +122,8 @@ def search_2(hills: Hills, yield_search_states=False):
     yield bestpath
 
 
-def part2(text_input: str):
-    hills = Hills(text_input)
+def part2(parsed_heights):
+    hills = Hills(parsed_heights)
     bestpath = next(search_2(hills))
     return len(bestpath)
 
@@ -142,14 +141,18 @@ def path_to_xydata(path, x0, y0):
 
 
 def visualize(text_input: str, iterations_per_frame=10):
+    from matplotlib import pyplot as plt
+    import matplotlib.animation as animation
+    from matplotlib.patches import Circle
+
     fig, (ax1, ax2) = plt.subplots(nrows=2, ncols=1, figsize=(12, 9), facecolor="#333")
     ax1.set_title("Part 1", color="#ccc")
     ax2.set_title("Part 2", color="#ccc")
     ax1.axis("off")
     ax2.axis("off")
 
-    hills_1 = Hills(text_input)
-    hills_2 = Hills(text_input)
+    hills_1 = Hills(parse_heights(text_input))
+    hills_2 = Hills(parse_heights(text_input))
 
     ax1.imshow(hills_1.heights, interpolation="none", cmap="gray", aspect="auto")
     ax2.imshow(hills_1.heights, interpolation="none", cmap="gray", aspect="auto")
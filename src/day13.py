@@ -33,14 +33,14 @@ def in_right_order(left, right):
                 return res
 
 
-def part1(text_input):
+def parse(text_input):
     check_input(text_input)
-    pairs = text_input.split("\n\n")
+    return [eval(item) for item in text_input.replace("\n\n", "\n").split("\n")]
+
+
+def part1(packets):
     total = 0
-    for i, pair in enumerate(pairs):
-        left, right = pair.split("\n")
-        left = eval(left)
-        right = eval(right)
+    for i, (left, right) in enumerate(zip(packets[::2], packets[1::2])):
         if in_right_order(left, right):
             total += i + 1
     return total
@@ -60,12 +60,8 @@ def compare_sort(items):
     return compare_sort(before) + [item] + compare_sort(after)
 
 
-def part2(text_input):
-    check_input(text_input)
-    items = [eval(item) for item in text_input.replace("\n\n", "\n").split("\n")] + [
-        [[2]],
-        [[6]],
-    ]
+def part2(packets):
+    items = packets + [[[2]], [[6]]]
     sorted_items = compare_sort(items)
     i1, i2, *_ = [
         i + 1 for i, item in enumerate(sorted_items) if str(item) in ("[[2]]", "[[6]]")
@@ -2,10 +2,6 @@
 # Problem statement: https://adventofcode.com/2022/day/14
 
 from pathlib import Path
-from matplotlib import pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.patches import Rectangle, Circle
-from matplotlib.collections import PatchCollection
 from collections import namedtuple
 
 day_title = "Regolith Reservoir"
@@ -14,17 +10,25 @@ day_title = "Regolith Reservoir"
 Point = namedtuple("Point", ["x", "y"])
 
 
+def parse_rocks(text_input: str):
+    rocks = {}
+    for segment in text_input.split("\n"):
+        points = segment.split(" -> ")
+        points = [Point(*map(int, point.split(","))) for point in points]
+        for p1, p2 in zip(points[:-1], points[1:]):
+            for x in range(min(p1.x, p2.x), max(p1.x + 1, p2.x + 1)):
+                for y in range(min(p1.y, p2.y), max(p1.y + 1, p2.y + 1)):
+                    rocks[Point(x, y)] = "rock"
+    return rocks
+
+
+parse = parse_rocks
+
+
 class Cave:
-    def __init__(self, text_input: str, floor=False):
+    def __init__(self, rocks: dict, floor=False):
         self.start = Point(500, 0)
-        self.cave = {}
-        for segment in text_input.split("\n"):
-            points = segment.split(" -> ")
-            points = [Point(*map(int, point.split(","))) for point in points]
-            for p1, p2 in zip(points[:-1], points[1:]):
-                for x in range(min(p1.x, p2.x), max(p1.x + 1, p2.x + 1)):
-                    for y in range(min(p1.y, p2.y), max(p1.y + 1, p2.y + 1)):
-                        self.cave[Point(x, y)] = "rock"
+        self.cave = dict(rocks)
         self.maxy = max(point.y for point in self.cave.keys())
         self.floor = floor
         self.fall_route = [self.start]
@@ -54,16 +58,16 @@ class Cave:
         return point
 
 
-def part1(text_input):
-    cave = Cave(text_input, floor=False)
+def part1(rocks):
+    cave = Cave(rocks, floor=False)
     sand = 0
     while cave.drop_sand_grain() is not None:
         sand += 1
     return sand
 
 
-def part2(text_input):
-    cave = Cave(text_input, floor=True)
+def part2(rocks):
+    cave = Cave(rocks, floor=True)
     sand = 0
     while cave.drop_sand_grain() != cave.start:
         sand += 1
@@ -71,6 +75,11 @@ def part2(text_input):
 
 
 def visualize(text_input: str):
+    from matplotlib import pyplot as plt
+    import matplotlib.animation as animation
+    from matplotlib.patches import Rectangle, Circle
+    from matplotlib.collections import PatchCollection
+
     # This animation gets really laggy with more sand
     # Because I don't know how to do "add circle and forget about it"
     # So thousands of sand circles are redrawn with each frame
@@ -79,7 +88,7 @@ def visualize(text_input: str):
     fig, ax = plt.subplots(figsize=(FW, FH), facecolor="#444")
     ax.axis("off")
 
-    cave = Cave(text_input, floor=False)
+    cave = Cave(parse_rocks(text_input), floor=False)
     xmax = max(p.x for p in cave.cave.keys())
     xmin = min(p.x for p in cave.cave.keys())
     ylim = (-1, cave.maxy + 3)
@@ -29,12 +29,14 @@ def parse_input(text_input):
     return res
 
 
-def part1(text_input):
+parse = parse_input
+
+
+def part1(sensors_beacons):
     y = 2000000
     # y = 10
     impossible = Segment1DCollection([])
     beacons = set()
-    sensors_beacons = parse_input(text_input)
     for sensor, beacon in sensors_beacons:
         if beacon.y == y:
             beacons.add(beacon.x)
@@ -48,10 +50,9 @@ def part1(text_input):
     return len(impossible) - sum(b in impossible for b in beacons)
 
 
-def part2(text_input):
+def part2(sensors_beacons):
     # L = 20
     L = 4000000
-    sensors_beacons = parse_input(text_input)
 
     # rotate the board 45 degrees and use coordinates (d,p) instead of (x,y)
     # d = x + y - L
@@ -2,16 +2,22 @@
 # Problem statement: https://adventofcode.com/2022/day/16
 
 import re
-import networkx as nx
 import heapq
-from collections import namedtuple
+import numpy as np
+from pathlib import Path
+from collections import namedtuple, deque
+from itertools import chain
+from util import LRUSet
 
 
 day_title = "Proboscidea Volcanium"
 
+# print Cave search stats after solving
+VERBOSE = False
+
 
 Valve = namedtuple("Valve", ["label", "flow_rate", "tunnels"])
-ExplorerState = namedtuple("ExplorerState", ["id", "turns", "position"])
+ExplorerState = namedtuple("ExplorerState", ["turns", "position"])
 State = namedtuple("State", ["pressure", "explorers", "closed_valves"])
 
 valve_regex = re.compile(
@@ -19,43 +25,103 @@ valve_regex = re.compile(
 )
 
 
+def parse_valves(text_input: str):
+    valves = {}
+    for line in text_input.split("\n"):
+        label, flow, tunnels = re.findall(valve_regex, line)[0]
+        valves[label] = Valve(label, int(flow), tuple(tunnels.split(", ")))
+    return valves
+
+
+parse = parse_valves
+
+
+def valve_distances(valves: dict, sources: list, targets: list) -> list:
+    """Shortest distances from sources to targets as a flat list
+
+    Distance from sources[i] to targets[j] is at index i * len(targets) + j.
+    Runs a BFS from every source, so it's fine for caves with thousands
+    of valves as long as there are few sources.
+    """
+    distances = []
+    for source in sources:
+        steps = {source: 0}
+        queue = deque([source])
+        while len(queue) > 0:
+            label = queue.popleft()
+            for tunnel in valves[label].tunnels:
+                if tunnel not in steps:
+                    steps[tunnel] = steps[label] + 1
+                    queue.append(tunnel)
+        distances.extend(steps[target] for target in targets)
+    return distances
+
+
 class Cave:
-    def __init__(self, text_input: str, turns: int, n_explorers=1):
-        self.valves = self.parse_valves(text_input)
+    def __init__(
+        self,
+        valves: dict,
+        turns: int,
+        n_explorers=1,
+        seen_capacity=2**20,
+        bound="greedy",
+    ):
+        self.valves = valves
         self.turns = turns
         self.n_explorers = n_explorers
         self.nonzero_valves = set(
             label for label, v in self.valves.items() if v.flow_rate > 0
         )
-        graph = nx.Graph()
-        graph.add_edges_from(
-            [
-                (valve.label, tunnel)
-                for valve in self.valves.values()
-                for tunnel in valve.tunnels
-            ]
+        targets = sorted(self.nonzero_valves)
+        sources = targets + ["AA"]
+        self.distances = valve_distances(valves, sources, targets)
+        # offsets of sources and targets in the flat distances list
+        self.rows = {label: i * len(targets) for i, label in enumerate(sources)}
+        self.columns = {label: j for j, label in enumerate(targets)}
+        # turns needed to walk between two valves and open the second one
+        self.step = 1 + min(
+            (self.distance(a, b) for a in targets for b in targets if a != b),
+            default=1,
         )
-        self.distances = dict(nx.all_pairs_shortest_path_length(graph))
-        self.seen = set()  # cache of seen states to avoid repeats
-
-    def parse_valves(self, text_input: str):
-        valves = {}
-        for line in text_input.split("\n"):
-            label, flow, tunnels = re.findall(valve_regex, line)[0]
-            valves[label] = Valve(label, int(flow), tuple(tunnels.split(", ")))
-        return valves
+        # turns needed to walk to the closest valve that could still be closed
+        self.nearest = {
+            a: min((self.distance(a, b) for b in targets if b != a), default=1)
+            for a in targets
+        }
+        self.nearest["AA"] = min((self.distance("AA", b) for b in targets), default=1)
+        # cache of seen states to avoid repeats, bounded to save memory
+        self.seen = LRUSet(seen_capacity)
+        bounds = {
+            "shadow": self.shadow_clone_bound,
+            "greedy": self.greedy_bound,
+            "min": self.min_bound,
+        }
+        if bound not in bounds:
+            raise ValueError(f"Unknown bound {bound}, expected one of {list(bounds)}")
+        self.upper_bound = bounds[bound]
+        self.expanded = 0
+        self.bound_calls = 0
+        self.pruned = 0
 
     def initial_state(self):
         return State(
             pressure=0,
-            explorers=tuple(
-                ExplorerState(id=i, turns=self.turns, position="AA")
-                for i in range(self.n_explorers)
+            explorers=(ExplorerState(turns=self.turns, position="AA"),)
+            * self.n_explorers,
+            # biggest flows first, so closed valves always stay sorted by flow
+            closed_valves=tuple(
+                sorted(
+                    self.nonzero_valves,
+                    key=lambda label: self.valves[label].flow_rate,
+                    reverse=True,
+                )
             ),
-            closed_valves=tuple(self.nonzero_valves),
         )
 
-    def upper_bound(self, state: State) -> int:
+    def distance(self, source: str, target: str) -> int:
+        return self.distances[self.rows[source] + self.columns[target]]
+
+    def shadow_clone_bound(self, state: State) -> int:
         """Upper bound of pressure achievable from current state
 
         If we could send out shadow clones to all closed valves simultaneously
@@ -66,16 +132,49 @@ class Cave:
             flow = self.valves[label].flow_rate
             could_gain = 0
             for explorer in state.explorers:
-                distance = self.distances[explorer.position][label]
+                distance = self.distance(explorer.position, label)
                 gain = (explorer.turns - distance - 1) * flow
                 could_gain = max(could_gain, gain)
             pressure += could_gain
         return pressure
 
+    def greedy_bound(self, state: State) -> int:
+        """Upper bound of pressure achievable from current state
+
+        Every explorer could open valves at best every self.step turns
+        starting from the nearest valve. Pairing the biggest closed flows
+        with the most turns left in these slots can't be beaten.
+        """
+        n = len(state.closed_valves)
+        slots = []
+        for explorer in state.explorers:
+            turns = explorer.turns - self.nearest[explorer.position] - 1
+            slots.extend(range(turns, 0, -self.step)[:n])
+        slots.sort(reverse=True)
+        flows = (self.valves[label].flow_rate for label in state.closed_valves)
+        return state.pressure + sum(f * t for f, t in zip(flows, slots))
+
+    def min_bound(self, state: State) -> int:
+        return min(self.greedy_bound(state), self.shadow_clone_bound(state))
+
+    @staticmethod
+    def canonical_explorers(explorers) -> tuple:
+        """Explorers are interchangeable, so keep them sorted by turns left.
+
+        Explorers with at most one turn left can't open anything any more,
+        so where they stand doesn't matter either.
+        """
+        return tuple(
+            sorted(
+                (e if e.turns > 1 else ExplorerState(0, "AA") for e in explorers),
+                reverse=True,
+            )
+        )
+
     def explore_next_states(self, state: State):
         """Generate next states depending on which valve to open next"""
-        # select whoever has the most turns left
-        explorer = max(state.explorers, key=lambda x: x.turns)
+        # whoever has the most turns left goes first
+        explorer, others = state.explorers[0], state.explorers[1:]
         if explorer.turns <= 1:
             # no time to do anything else from here
             return []
@@ -83,60 +182,35 @@ class Cave:
         # they could try and open one of the currently closed valves
         for label in state.closed_valves:
             flow = self.valves[label].flow_rate
-            distance = self.distances[explorer.position][label]
-            gain = (explorer.turns - distance - 1) * flow
-            if gain <= 0:
+            distance = self.distance(explorer.position, label)
+            turns = explorer.turns - distance - 1
+            if turns * flow <= 0:
                 continue
             states.append(
                 State(
-                    pressure=state.pressure + gain,
-                    explorers=tuple(
-                        (
-                            e
-                            if e != explorer
-                            else ExplorerState(
-                                id=explorer.id,
-                                turns=explorer.turns - distance - 1,
-                                position=label,
-                            )
-                            for e in state.explorers
-                        )
+                    pressure=state.pressure + turns * flow,
+                    explorers=self.canonical_explorers(
+                        others + (ExplorerState(turns, label),)
                     ),
                     closed_valves=tuple(v for v in state.closed_valves if v != label),
                 )
             )
         # or they could do nothing at all
         # and let the other explorers handle things
-        if len(state.explorers) > 0:
-            states.append(
-                State(
-                    pressure=state.pressure,
-                    explorers=tuple(
-                        (
-                            e
-                            if e != explorer
-                            else ExplorerState(
-                                id=explorer.id, turns=0, position=explorer.position
-                            )
-                            for e in state.explorers
-                        )
-                    ),
-                    closed_valves=state.closed_valves,
-                )
+        states.append(
+            State(
+                pressure=state.pressure,
+                explorers=self.canonical_explorers(others + (ExplorerState(0, "AA"),)),
+                closed_valves=state.closed_valves,
             )
+        )
         return states
 
     def have_seen_this_state(self, state):
-        gist = tuple(
-            (
-                state.pressure,
-                *sorted((e.turns, e.position) for e in state.explorers),
-                state.closed_valves,
-            )
-        )
-        if gist in self.seen:
+        # explorers are canonical so equivalent states are equal
+        if state in self.seen:
             return True
-        self.seen.add(gist)
+        self.seen.add(state)
         return False
 
     def best_pressure(self):
@@ -150,11 +224,14 @@ class Cave:
             neg_ub, prev_state = heapq.heappop(queue)
             if -neg_ub <= best:
                 continue
+            self.expanded += 1
             for state in self.explore_next_states(prev_state):
                 if state.pressure > best:
                     best = state.pressure
                 ub = self.upper_bound(state)
+                self.bound_calls += 1
                 if ub <= best:
+                    self.pruned += 1
                     continue
                 if self.have_seen_this_state(state):
                     continue
@@ -166,14 +243,214 @@ class Cave:
                 #     )
         return best
 
+    def stats_str(self):
+        ratio = self.pruned / self.bound_calls if self.bound_calls > 0 else 0
+        return (
+            f"{self.expanded} nodes expanded, {self.bound_calls} bound calls, "
+            f"{ratio:.1%} pruned, seen states: {self.seen}"
+        )
+
 
-def part1(text_input):
-    cave = Cave(text_input, turns=30, n_explorers=1)
-    best = cave.best_pressure()
+class ValveSubsets:
+    """Best pressure for every subset of valves that one explorer can open
+
+    Nonzero valves get indices 0..k-1 and the starting valve AA gets index k,
+    so a set of open valves is a bitmask and distances are a dense matrix.
+    Search states are keyed by (position, opened mask) and a state is only
+    expanded if no state seen before beats it on both turns left and
+    pressure, so different orders of opening the same valves get merged.
+    """
+
+    def __init__(self, valves: dict, start="AA"):
+        self.labels = sorted(label for label, v in valves.items() if v.flow_rate > 0)
+        self.flows = [valves[label].flow_rate for label in self.labels]
+        k = len(self.labels)
+        distances = valve_distances(valves, self.labels + [start], self.labels)
+        # turns it takes to get from one valve to another and open it,
+        # from valve i to valve j at index i * k + j
+        self.costs = [d + 1 for d in distances]
+        # fewest turns any move takes and valves by flow for the upper bound
+        self.step = min(
+            (self.costs[i * k + j] for i in range(k + 1) for j in range(k) if i != j),
+            default=1,
+        )
+        self.by_flow = sorted(range(k), key=lambda i: self.flows[i], reverse=True)
+        self.slots = {}  # (turns_left, partner_turns): upper bound slots
+
+    def upper_bound(self, turns_left, opened, pressure, partner_turns=0) -> int:
+        """Pressure if the biggest closed valves opened every self.step turns
+
+        With partner_turns a second explorer that has yet to start opens
+        valves every self.step turns too.
+        """
+        slots = self.slots.get((turns_left, partner_turns))
+        if slots is None:
+            slots = sorted(
+                chain(
+                    range(turns_left - self.step, 0, -self.step),
+                    range(partner_turns - self.step, 0, -self.step),
+                ),
+                reverse=True,
+            )
+            self.slots[(turns_left, partner_turns)] = slots
+        flows = (self.flows[i] for i in self.by_flow if not opened & (1 << i))
+        return pressure + sum(f * t for f, t in zip(flows, slots))
+
+    def greedy_pair_pressure(self, turns: int) -> int:
+        """Pressure two explorers release if the one with the most turns left
+        always opens the valve that adds the most, a quick lower bound"""
+        k = len(self.labels)
+        explorers = [(turns, k), (turns, k)]
+        opened = 0
+        pressure = 0
+        while len(explorers) > 0:
+            explorers.sort()
+            turns_left, position = explorers.pop()
+            gain, i = max(
+                (
+                    ((turns_left - self.costs[position * k + i]) * self.flows[i], i)
+                    for i in range(k)
+                    if not opened & (1 << i)
+                ),
+                default=(0, None),
+            )
+            if gain <= 0:
+                continue
+            pressure += gain
+            opened |= 1 << i
+            explorers.append((turns_left - self.costs[position * k + i], i))
+        return pressure
+
+    def best_by_subset(
+        self, turns: int, prune=False, at_least=0, pair_at_least=0, opened=0
+    ) -> dict:
+        """Map bitmask of opened valves to best pressure achievable opening them
+
+        States whose upper bound is below at_least are dropped. So are
+        states that can't beat the best total so far with prune=True, and
+        states that can't be part of a pair of explorers releasing
+        pair_at_least. Only subsets that can reach these totals are
+        guaranteed right. Valves in the opened mask count as already open.
+        """
+        k = len(self.labels)
+        best = {opened: 0}
+        best_total = 0
+        # (position, opened) -> list of (turns_left, pressure) seen so far
+        seen = {}
+        stack = [(k, turns, opened, 0)]
+        while len(stack) > 0:
+            position, turns_left, opened, pressure = stack.pop()
+            floor = max(at_least, best_total + 1) if prune else at_least
+            if self.upper_bound(turns_left, opened, pressure) < floor:
+                continue
+            if (
+                pair_at_least > 0
+                and self.upper_bound(turns_left, opened, pressure, turns)
+                < pair_at_least
+            ):
+                continue
+            row = position * k
+            # biggest flows go on top of the stack to find good totals early
+            for i in reversed(self.by_flow):
+                bit = 1 << i
+                if opened & bit:
+                    continue
+                left = turns_left - self.costs[row + i]
+                if left <= 0:
+                    continue
+                mask = opened | bit
+                total = pressure + left * self.flows[i]
+                if total > best.get(mask, -1):
+                    best[mask] = total
+                    best_total = max(best_total, total)
+                states = seen.get((i, mask))
+                if states is None:
+                    seen[(i, mask)] = [(left, total)]
+                elif not add_state(states, left, total):
+                    continue
+                stack.append((i, left, mask, total))
+        return best
+
+    def best_pressure(self, turns: int) -> int:
+        return max(self.best_by_subset(turns, prune=True).values())
+
+    def best_pair_pressure(self, turns: int) -> int:
+        """Best pressure two explorers can release opening disjoint valve sets"""
+        # a good pair to start with: the best single explorer and the best
+        # one after them, or both explorers going greedy
+        first = self.best_by_subset(turns, prune=True)
+        mask1, pressure1 = max(first.items(), key=lambda x: x[1])
+        second = self.best_by_subset(turns, prune=True, opened=mask1)
+        lower = max(pressure1 + max(second.values()), self.greedy_pair_pressure(turns))
+        # in a better pair each explorer gets more than lower - pressure1
+        # as noone beats pressure1, and they only open valves the other
+        # one doesn't, so they can be bounded together too
+        subsets = self.best_by_subset(
+            turns, at_least=lower - pressure1 + 1, pair_at_least=lower + 1
+        )
+        k = len(self.labels)
+        if k > 24:
+            # too many masks to tabulate, so check pairs best first instead
+            return pair_by_pairs(subsets, lower)
+        # best pressure of any subset of every mask, one valve at a time
+        within = np.zeros(1 << k, dtype=np.int32)
+        masks = np.fromiter(subsets.keys(), dtype=np.int64, count=len(subsets))
+        pressures = np.fromiter(subsets.values(), dtype=np.int32, count=len(subsets))
+        within[masks] = pressures
+        for i in range(k):
+            halves = within.reshape(-1, 2, 1 << i)
+            np.maximum(halves[:, 1], halves[:, 0], out=halves[:, 1])
+        # the other explorer opens valves the first one doesn't
+        return max(lower, int((pressures + within[((1 << k) - 1) ^ masks]).max()))
+
+
+def pair_by_pairs(subsets: dict, best=0) -> int:
+    """Best sum of pressures of two disjoint masks in subsets, if above best"""
+    subsets = sorted(subsets.items(), key=lambda x: x[1], reverse=True)
+    for i, (mask1, pressure1) in enumerate(subsets):
+        if pressure1 * 2 <= best:
+            break
+        for mask2, pressure2 in subsets[i:]:
+            if pressure1 + pressure2 <= best:
+                break
+            if mask1 & mask2 == 0:
+                best = pressure1 + pressure2
     return best
 
 
-def part2(text_input):
-    cave = Cave(text_input, turns=26, n_explorers=2)
+def add_state(states: list, turns_left: int, pressure: int) -> bool:
+    """Add a state unless another one has at least as many turns and pressure
+
+    Returns whether it was added. States it beats are removed.
+    """
+    for t, p in states:
+        if t >= turns_left and p >= pressure:
+            return False
+    states[:] = [(t, p) for t, p in states if t > turns_left or p > pressure]
+    states.append((turns_left, pressure))
+    return True
+
+
+def part1(valves):
+    cave = Cave(valves, turns=30)
     best = cave.best_pressure()
+    if VERBOSE:
+        print(cave.stats_str())
     return best
+
+
+def part2(valves):
+    return ValveSubsets(valves).best_pair_pressure(turns=26)
+
+
+if __name__ == "__main__":
+    # compare how well each upper bound prunes the search
+    folder = Path(__file__).parent.parent
+    with open(folder / "inputs" / "day16" / "task.txt") as f:
+        valves = parse_valves(f.read().rstrip())
+    for bound in ["shadow", "greedy", "min"]:
+        for n_explorers, turns in [(1, 30), (2, 26)]:
+            cave = Cave(valves, turns, n_explorers=n_explorers, bound=bound)
+            best = cave.best_pressure()
+            print(f"{bound} bound, {n_explorers} explorers: {best}")
+            print(f"  {cave.stats_str()}")
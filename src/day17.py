@@ -2,6 +2,7 @@
 # Problem statement: https://adventofcode.com/2022/day/17
 
 import numpy as np
+from util import CycleDetector
 
 
 day_title = "Pyroclastic Flow"
@@ -48,6 +49,16 @@ BLOCKS = [
 
 WINDS_DX = {"<": -1, ">": 1}
 
+# Same blocks for BitTetris: (width, row masks from the bottom up)
+# where bit x of a mask is set if the block covers column x
+BIT_BLOCKS = [
+    (
+        block.shape[1],
+        tuple(sum(1 << x for x in range(block.shape[1]) if row[x]) for row in block),
+    )
+    for block in BLOCKS
+]
+
 
 class Tetris:
     def __init__(self, wind_pattern, width=7):
@@ -103,6 +114,120 @@ class Tetris:
         return "\n".join(res)
 
 
+class BitTetris:
+    """Tetris keeping each tower row as a width-bit integer.
+
+    Blocks are tuples of row masks, so checking a collision is an AND
+    per block row instead of numpy operations on small arrays.
+    Collision checks are inlined into drop_block as it is the hot loop.
+    Has the same interface as Tetris.
+
+    Only rows above the floor are kept. The floor rises above every full
+    row as nothing can fall below it, and with depth set it is also kept
+    at most depth rows below the top (which assumes no block falls deeper).
+    tower[i] is row offset + i, rows below the floor count as blocked.
+    """
+
+    def __init__(self, wind_pattern, width=7, depth=None):
+        self.width = width
+        self.wind_pattern = wind_pattern
+        self.winds = [WINDS_DX[wind] for wind in wind_pattern]
+        self.depth = depth
+        self.full_row = (1 << width) - 1
+        self.tower = []  # row masks from the bottom up
+        self.offset = 0  # height of the first row in self.tower
+        self.floor = 0  # rows below this height are blocked
+        self.shifted_blocks = [
+            [tuple(mask << x for mask in masks) for x in range(width - block_width + 1)]
+            for block_width, masks in BIT_BLOCKS
+        ]
+        self.highest = 0
+        self.wind_index = 0
+        self.block_index = 0
+
+    def drop_block(self):
+        block_width, masks = BIT_BLOCKS[self.block_index]
+        self.block_index = (self.block_index + 1) % len(BIT_BLOCKS)
+        # block masks for every possible x
+        shifted = self.shifted_blocks[self.block_index - 1]
+        max_x = self.width - block_width
+        tower = self.tower
+        winds = self.winds
+        wind_index = self.wind_index
+        # y is relative to offset here
+        floor = self.floor - self.offset
+        x = 2
+        y = self.highest + 3 - self.offset
+        while True:
+            nx = x + winds[wind_index]
+            wind_index += 1
+            if wind_index == len(winds):
+                wind_index = 0
+            if 0 <= nx <= max_x:
+                for row, mask in zip(range(y, len(tower)), shifted[nx]):
+                    if tower[row] & mask:
+                        break
+                else:
+                    x = nx
+            if y == floor:
+                break
+            for row, mask in zip(range(y - 1, len(tower)), shifted[x]):
+                if tower[row] & mask:
+                    break
+            else:
+                y -= 1
+                continue
+            break
+        self.wind_index = wind_index
+        top = y + len(masks)
+        if top > len(tower):
+            tower.extend([0] * (top - len(tower)))
+        for row, mask in enumerate(shifted[x], start=y):
+            tower[row] |= mask
+            if tower[row] == self.full_row:
+                floor = max(floor, row + 1)
+        self.highest = max(self.highest, top + self.offset)
+        self.floor = floor + self.offset
+        if self.depth is not None:
+            self.floor = max(self.floor, self.highest - self.depth)
+        # drop rows below the floor in chunks so that it's cheap on average
+        if self.floor - self.offset > max(1024, len(tower) // 2):
+            del tower[: self.floor - self.offset]
+            self.offset = self.floor
+
+    def surface(self, max_depth=100):
+        """How far below the top is the highest blocked cell of every column
+
+        Looks no deeper than max_depth rows (or the floor) and reports
+        that depth for columns with nothing blocked so far down.
+        """
+        depths = [None] * self.width
+        missing = self.width
+        y = self.highest - 1 - self.offset
+        bottom = max(self.floor, self.highest - max_depth) - self.offset
+        while missing > 0 and y >= bottom:
+            row = self.tower[y]
+            for x in range(self.width):
+                if depths[x] is None and row >> x & 1:
+                    depths[x] = self.highest - self.offset - y - 1
+                    missing -= 1
+            y -= 1
+        bottom_depth = self.highest - self.offset - bottom
+        return tuple(bottom_depth if d is None else d for d in depths)
+
+    def to_str(self, top_rows=30):
+        res = []
+        for y in range(self.highest, max(0, self.highest - top_rows) - 1, -1):
+            if y < self.floor:
+                row = self.full_row
+            elif y - self.offset < len(self.tower):
+                row = self.tower[y - self.offset]
+            else:
+                row = 0
+            res.append("".join("#" if row >> x & 1 else "." for x in range(self.width)))
+        return "\n".join(res)
+
+
 def history_aware_drop(tetris: Tetris, rounds=2022, top_rows=30):
     i = 0
     # state_index: (round, height, top_rows_string)
@@ -128,13 +253,30 @@ def history_aware_drop(tetris: Tetris, rounds=2022, top_rows=30):
     return tetris.highest + repeated_height
 
 
+def cycle_aware_drop(tetris: BitTetris, rounds=2022, detector=None):
+    """Tower height after rounds, extrapolated once the drops start to cycle.
+
+    States are told apart by block and wind indices and the surface
+    of the tower. Pass a CycleDetector to look at cycle stats afterwards.
+    """
+    if detector is None:
+        detector = CycleDetector()
+    for _ in range(rounds):
+        tetris.drop_block()
+        state = (tetris.block_index, tetris.wind_index, tetris.surface())
+        if detector.update(state, tetris.highest):
+            # height after n rounds is the value at step n - 1
+            return detector.extrapolate(rounds - 1)
+    return tetris.highest
+
+
 def part1(text_input):
-    tetris = Tetris(text_input)
+    tetris = BitTetris(text_input)
     for _ in range(2022):
         tetris.drop_block()
     return tetris.highest
 
 
 def part2(text_input):
-    tetris = Tetris(text_input)
-    return history_aware_drop(tetris, rounds=1000000000000)
+    tetris = BitTetris(text_input)
+    return cycle_aware_drop(tetris, rounds=1000000000000)
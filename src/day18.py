@@ -19,8 +19,10 @@ def get_lava_points_set(text_input):
     return res
 
 
-def part1(text_input):
-    lava = get_lava_points_set(text_input)
+parse = get_lava_points_set
+
+
+def part1(lava):
     surface_area = 0
     for point in lava:
         for dx, dy, dz in DELTAS:
@@ -30,9 +32,8 @@ def part1(text_input):
     return surface_area
 
 
-def part2(text_input):
+def part2(lava):
     # flood fill from outside, count lava neighbours
-    lava = get_lava_points_set(text_input)
     xmin, ymin, zmin = [math.inf] * 3
     xmax, ymax, zmax = [-math.inf] * 3
     for x, y, z in lava:
@@ -2,12 +2,20 @@
 # Problem statement: https://adventofcode.com/2022/day/19
 
 import math
+import os
+import time
 from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 import heapq
 import re
 
 day_title = "Not Enough Minerals"
 
+# part1 and part2 settings for evaluate_blueprints
+JOBS = 1
+TIMEOUT = None
+VERBOSE = False
+
 BLUEPRINT_REGEX = re.compile(
     r"Blueprint (\d+): Each ore robot costs (\d+) ore. Each clay robot costs (\d+) ore. Each obsidian robot costs (\d+) ore and (\d+) clay. Each geode robot costs (\d+) ore and (\d+) obsidian."
 )
@@ -34,6 +42,13 @@ FactoryState = namedtuple(
         "geodes",
     ],
 )
+CRAFTS = ("ore", "clay", "obsidian", "geode")
+
+# geodes and crafts are None if the search ran out of time
+# expanded is the number of states explored
+BlueprintResult = namedtuple(
+    "BlueprintResult", ["id", "geodes", "crafts", "seconds", "expanded"]
+)
 
 
 def parse_blueprint(line: str):
@@ -55,6 +70,7 @@ class Factory:
         )
         self.max_clay_need = blueprint.obsidian_robot_cost_clay
         self.max_obsidian_need = blueprint.geode_robot_cost_obsidian
+        self.geode_bounds = {}
 
     def initial_state(self):
         return FactoryState(self.max_turns, 0, 1, 0, 0, 0, 0, 0)
@@ -65,13 +81,10 @@ class Factory:
         Suppose resources are not consumed when building robots.
         So we only have to save up enough resources for the first build of every robot kind.
         """
-        ore = state.ore
-        clay = state.clay
-        obsi = state.obsidian
-        r_ore = state.ore_robots
-        r_clay = state.clay_robots
-        r_obsi = state.obsidian_robots
-        turns = state.turns
+        return self.upper_bound(*state)
+
+    def upper_bound(self, turns, ore, r_ore, clay, r_clay, obsi, r_obsi, geodes):
+        """geodes_upper_bound taking state fields as plain ints"""
         while turns > 0:
             turns -= 1
             ore += r_ore
@@ -84,8 +97,31 @@ class Factory:
             elif r_obsi == 0 or obsi < self.blueprint.geode_robot_cost_obsidian:
                 r_obsi += 1
             else:
-                return state.geodes + sum(i + 1 for i in range(turns))
-        return state.geodes
+                return geodes + sum(i + 1 for i in range(turns))
+        return geodes
+
+    def geode_bound(self, turns, r_obsi, obsi):
+        """Can open no more than this many extra geodes from this state.
+
+        Suppose ore and clay are unlimited, so every turn we get
+        a new obsidian robot for free and build a geode robot if there's
+        enough obsidian. Depends only on turns, obsidian robots and obsidian,
+        so results are memoized.
+        """
+        key = (turns, r_obsi, obsi)
+        if key in self.geode_bounds:
+            return self.geode_bounds[key]
+        cost = self.blueprint.geode_robot_cost_obsidian
+        geodes = 0
+        while turns > 1:
+            turns -= 1
+            if obsi >= cost:
+                obsi -= cost
+                geodes += turns
+            obsi += r_obsi
+            r_obsi += 1
+        self.geode_bounds[key] = geodes
+        return geodes
 
     def explore_next_crafts(self, state: FactoryState):
         if state.ore_robots < self.max_ore_need:
@@ -183,8 +219,106 @@ class Factory:
                     ),
                 )
 
+    def next_states(self, state: tuple):
+        """explore_next_crafts for plain tuple states, crafts are CRAFTS indices"""
+        turns, ore, r_ore, clay, r_clay, obsi, r_obsi, geodes = state
+        bp = self.blueprint
+        states = []
+        if r_ore < self.max_ore_need:
+            wait = max(0, -((ore - bp.ore_robot_cost) // r_ore)) + 1
+            if turns - wait > 0:
+                states.append(
+                    (
+                        0,
+                        (
+                            turns - wait,
+                            ore + r_ore * wait - bp.ore_robot_cost,
+                            r_ore + 1,
+                            clay + r_clay * wait,
+                            r_clay,
+                            obsi + r_obsi * wait,
+                            r_obsi,
+                            geodes,
+                        ),
+                    )
+                )
+        if r_clay < self.max_clay_need:
+            wait = max(0, -((ore - bp.clay_robot_cost) // r_ore)) + 1
+            if turns - wait > 0:
+                states.append(
+                    (
+                        1,
+                        (
+                            turns - wait,
+                            ore + r_ore * wait - bp.clay_robot_cost,
+                            r_ore,
+                            clay + r_clay * wait,
+                            r_clay + 1,
+                            obsi + r_obsi * wait,
+                            r_obsi,
+                            geodes,
+                        ),
+                    )
+                )
+        if r_obsi < self.max_obsidian_need and r_clay > 0:
+            wait = (
+                max(
+                    0,
+                    -((ore - bp.obsidian_robot_cost_ore) // r_ore),
+                    -((clay - bp.obsidian_robot_cost_clay) // r_clay),
+                )
+                + 1
+            )
+            if turns - wait > 0:
+                states.append(
+                    (
+                        2,
+                        (
+                            turns - wait,
+                            ore + r_ore * wait - bp.obsidian_robot_cost_ore,
+                            r_ore,
+                            clay + r_clay * wait - bp.obsidian_robot_cost_clay,
+                            r_clay,
+                            obsi + r_obsi * wait,
+                            r_obsi + 1,
+                            geodes,
+                        ),
+                    )
+                )
+        if r_obsi > 0:
+            wait = (
+                max(
+                    0,
+                    -((ore - bp.geode_robot_cost_ore) // r_ore),
+                    -((obsi - bp.geode_robot_cost_obsidian) // r_obsi),
+                )
+                + 1
+            )
+            if turns - wait > 0:
+                states.append(
+                    (
+                        3,
+                        (
+                            turns - wait,
+                            ore + r_ore * wait - bp.geode_robot_cost_ore,
+                            r_ore,
+                            clay + r_clay * wait,
+                            r_clay,
+                            obsi + r_obsi * wait - bp.geode_robot_cost_obsidian,
+                            r_obsi,
+                            geodes + turns - wait,
+                        ),
+                    )
+                )
+        return states
+
+
+def most_geodes(blueprint: Blueprint, turns: int, time_limit=None):
+    """Most geodes one can open in given turns and the crafts to do it.
 
-def most_geodes(blueprint: Blueprint, turns: int):
+    Raises TimeoutError if this takes longer than time_limit seconds.
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
     factory = Factory(blueprint, turns)
     start = factory.initial_state()
     queue = [(0, 0, 0, start, "")]
@@ -194,6 +328,8 @@ def most_geodes(blueprint: Blueprint, turns: int):
     iteration = 0
     while len(queue) > 0:
         _, _, _, state, previous_crafts = heapq.heappop(queue)
+        if deadline is not None and time.perf_counter() > deadline:
+            raise TimeoutError(f"Blueprint {blueprint.id} took over {time_limit} s")
         for craft, next_state in factory.explore_next_crafts(state):
             geodes = next_state.geodes
             if geodes > best_geodes:
@@ -215,19 +351,173 @@ def most_geodes(blueprint: Blueprint, turns: int):
     return best_geodes, best_crafts
 
 
-def part1(text_input: str):
+def dominated(pareto: dict, state: tuple) -> bool:
+    """Check if a seen state with the same robots and turns is at least as good.
+
+    That is it has at least as many resources and geodes.
+    Otherwise state is added to the Pareto front of its robots and turns.
+    """
+    turns, ore, r_ore, clay, r_clay, obsi, r_obsi, geodes = state
+    front = pareto.setdefault((turns, r_ore, r_clay, r_obsi), [])
+    for o_ore, o_clay, o_obsi, o_geodes in front:
+        if o_ore >= ore and o_clay >= clay and o_obsi >= obsi and o_geodes >= geodes:
+            return True
+    front[:] = [
+        other
+        for other in front
+        if not (
+            other[0] <= ore
+            and other[1] <= clay
+            and other[2] <= obsi
+            and other[3] <= geodes
+        )
+    ]
+    front.append((ore, clay, obsi, geodes))
+    return False
+
+
+def most_geodes_dfs(
+    blueprint: Blueprint, turns: int, time_limit=None, prune=True, stats=None
+):
+    """Depth first version of most_geodes working on plain tuples of ints.
+
+    States don't carry their crafts history. Instead every kept state
+    remembers its parent and the craft that led to it, so the crafts are
+    only put together for the best state in the end.
+
+    With prune=True states go through the memoized geode_bound before
+    the slower upper_bound, and states that are no better than a seen
+    state with the same robots and turns left are dropped.
+    If stats is a dict it gets counts of expanded and pruned states.
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    factory = Factory(blueprint, turns)
+    # parent node and craft for every node, node 0 is the initial state
+    parents = [(None, None)]
+    stack = [(tuple(factory.initial_state()), 0)]
+    pareto = {}
+    best_geodes = 0
+    best_node = 0
+    expanded = pruned_by_bound = pruned_by_dominance = 0
+    try:
+        while len(stack) > 0:
+            state, node = stack.pop()
+            expanded += 1
+            if deadline is not None and expanded % 1024 == 0:
+                if time.perf_counter() > deadline:
+                    raise TimeoutError(
+                        f"Blueprint {blueprint.id} took over {time_limit} s"
+                    )
+            # geode robot comes last so it gets explored first
+            for craft, next_state in factory.next_states(state):
+                child = None
+                geodes = next_state[-1]
+                if geodes > best_geodes:
+                    parents.append((node, craft))
+                    child = len(parents) - 1
+                    best_geodes, best_node = geodes, child
+                turns_left, obsi, r_obsi = next_state[0], next_state[5], next_state[6]
+                if (
+                    prune
+                    and geodes + factory.geode_bound(turns_left, r_obsi, obsi)
+                    <= best_geodes
+                    or factory.upper_bound(*next_state) <= best_geodes
+                ):
+                    pruned_by_bound += 1
+                    continue
+                if prune and dominated(pareto, next_state):
+                    pruned_by_dominance += 1
+                    continue
+                if child is None:
+                    parents.append((node, craft))
+                    child = len(parents) - 1
+                stack.append((next_state, child))
+    finally:
+        # also filled in when the search times out
+        if stats is not None:
+            stats["expanded"] = expanded
+            stats["pruned_by_bound"] = pruned_by_bound
+            stats["pruned_by_dominance"] = pruned_by_dominance
+    crafts = []
+    node = best_node
+    while node != 0:
+        node, craft = parents[node]
+        crafts.append(CRAFTS[craft])
+    return best_geodes, "".join(" " + craft for craft in reversed(crafts))
+
+
+def evaluate_blueprint(blueprint: Blueprint, turns: int, timeout=None):
+    t0 = time.perf_counter()
+    stats = {}
+    try:
+        geodes, crafts = most_geodes_dfs(
+            blueprint, turns, time_limit=timeout, stats=stats
+        )
+    except TimeoutError:
+        geodes, crafts = None, None
+    return BlueprintResult(
+        blueprint.id,
+        geodes,
+        crafts,
+        time.perf_counter() - t0,
+        stats.get("expanded"),
+    )
+
+
+def evaluate_blueprints(blueprints, turns: int, jobs=1, timeout=None):
+    """Find most geodes for every blueprint, possibly in a process pool.
+
+    Returns a BlueprintResult per blueprint in the same order as blueprints.
+    With jobs=1 no pool is started, jobs=None uses all CPUs.
+    timeout limits seconds spent on each blueprint.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    jobs = min(jobs, len(blueprints))
+    if jobs <= 1:
+        return [evaluate_blueprint(b, turns, timeout) for b in blueprints]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        n = len(blueprints)
+        return list(
+            executor.map(evaluate_blueprint, blueprints, [turns] * n, [timeout] * n)
+        )
+
+
+def checked_results(blueprints, turns: int):
+    """Run evaluate_blueprints with the module settings.
+
+    Prints a line per blueprint when VERBOSE. Raises TimeoutError naming
+    the blueprints that ran out of time since the answer would be wrong.
+    """
+    results = evaluate_blueprints(blueprints, turns, jobs=JOBS, timeout=TIMEOUT)
+    if VERBOSE:
+        for result in results:
+            geodes = "timed out" if result.geodes is None else f"{result.geodes} geodes"
+            print(
+                f"Blueprint {result.id}: {geodes} "
+                f"({result.seconds:.3f} s, {result.expanded} expanded)"
+            )
+    timed_out = [result.id for result in results if result.geodes is None]
+    if timed_out:
+        raise TimeoutError(
+            f"Blueprints {timed_out} took over {TIMEOUT} s each, "
+            "raise day19.TIMEOUT or set it to None"
+        )
+    return results
+
+
+def parse(text_input: str):
+    return [parse_blueprint(line) for line in text_input.split("\n")]
+
+
+def part1(blueprints):
     total = 0
-    for line in text_input.split("\n"):
-        blueprint = parse_blueprint(line)
-        best_geodes, _ = most_geodes(blueprint, 24)
-        total += best_geodes * blueprint.id
+    for result in checked_results(blueprints, 24):
+        total += result.geodes * result.id
     return total
 
 
-def part2(text_input):
+def part2(blueprints):
     total = 1
-    for line in text_input.split("\n")[:3]:
-        blueprint = parse_blueprint(line)
-        best_geodes, _ = most_geodes(blueprint, 32)
-        total *= best_geodes
+    for result in checked_results(blueprints[:3], 32):
+        total *= result.geodes
     return total
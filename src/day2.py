@@ -27,11 +27,11 @@ outcomes = {
 }
 
 
-def part1(text_input):
+def part1_stream(lines):
     their_moves = {"A": R, "B": P, "C": S}
     my_moves = {"X": R, "Y": P, "Z": S}
     total = 0
-    for line in text_input.split("\n"):
+    for line in lines:
         their, mine = line.split()
         my_shape = my_moves[mine]
         their_shape = their_moves[their]
@@ -40,7 +40,7 @@ def part1(text_input):
     return total
 
 
-def part2(text_input):
+def part2_stream(lines):
     their_moves = {"A": R, "B": P, "C": S}
     outcome_codes = {"X": L, "Y": D, "Z": W}
     # repack the rules to get my shape from their shape and outcome
@@ -49,10 +49,18 @@ def part2(text_input):
         for (my_shape, their_shape), outcome in outcomes.items()
     }
     total = 0
-    for line in text_input.split("\n"):
+    for line in lines:
         their, outcome = line.split()
         their_shape = their_moves[their]
         outcome = outcome_codes[outcome]
         my_shape = my_moves[(their_shape, outcome)]
         total += shape_scores[my_shape] + outcome_scores[outcome]
     return total
+
+
+def part1(text_input):
+    return part1_stream(text_input.split("\n"))
+
+
+def part2(text_input):
+    return part2_stream(text_input.split("\n"))
@@ -62,16 +62,19 @@ class MixingList:
         return total
 
 
-def part1(text_input):
-    ls = [int(i) for i in text_input.split()]
-    mixer = MixingList(ls)
+def parse(text_input):
+    return [int(i) for i in text_input.split()]
+
+
+def part1(numbers):
+    mixer = MixingList(numbers)
     mixer.mix()
     return mixer.answer()
 
 
-def part2(text_input):
+def part2(numbers):
     key = 811589153
-    ls = [int(i) * key for i in text_input.split()]
+    ls = [i * key for i in numbers]
     mixer = MixingList(ls)
     for _ in range(10):
         mixer.mix()
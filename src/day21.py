@@ -42,15 +42,19 @@ def yell_fn(values, calcs):
     return yell
 
 
-def part1(text_input):
-    values, calcs = parse_input(text_input)
+parse = parse_input
+
+
+def part1(model):
+    values, calcs = model
     yell = yell_fn(values, calcs)
     result = int(yell("root"))
     return result
 
 
-def part2(text_input):
-    values, calcs = parse_input(text_input)
+def part2(model):
+    values, calcs = model
+    values, calcs = dict(values), dict(calcs)
 
     values["humn"] = Symbol("x")
     r1, _, r2 = calcs.pop("root")
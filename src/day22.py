@@ -3,10 +3,6 @@
 
 from pathlib import Path
 import numpy as np
-from matplotlib import pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.patches import Rectangle
-from matplotlib.collections import PatchCollection
 import re
 
 day_title = "Monkey Map"
@@ -206,23 +202,31 @@ class Cube:
         return nx, ny, ndir, next_cell
 
 
-def part1(text_input):
+def parse(text_input):
     board, moves = text_input.split("\n\n")
-    board = parse_board(board)
+    return parse_board(board), moves
+
+
+def part1(model):
+    board, moves = model
     geometry = WrappingBoard(board)
     x, y, direction = follow_path(geometry, moves)
     return 1000 * (y + 1) + 4 * (x + 1) + direction
 
 
-def part2(text_input):
-    board, moves = text_input.split("\n\n")
-    board = parse_board(board)
+def part2(model):
+    board, moves = model
     geometry = Cube(board)
     x, y, direction = follow_path(geometry, moves)
     return 1000 * (y + 1) + 4 * (x + 1) + direction
 
 
 def visualize(text_input):
+    from matplotlib import pyplot as plt
+    import matplotlib.animation as animation
+    from matplotlib.patches import Rectangle
+    from matplotlib.collections import PatchCollection
+
     board, moves = text_input.split("\n\n")
     board = parse_board(board)
     geometry = Cube(board)
@@ -2,8 +2,8 @@
 # Problem statement: https://adventofcode.com/2022/day/23
 
 import numpy as np
-from matplotlib import pyplot as plt
 from collections import Counter
+from functools import lru_cache
 
 day_title = "Unstable Diffusion"
 
@@ -169,13 +169,230 @@ def simulate(board, rounds=0):
     return board, iteration
 
 
-def part1(text_input):
-    board = parse_board(text_input)
-    board, _ = simulate(board, rounds=10)
+# neighbour (dy, dx) that must be free to propose a move in each direction
+LOOKOUTS = {
+    NORTH: ((-1, -1), (-1, 0), (-1, 1)),
+    SOUTH: ((1, -1), (1, 0), (1, 1)),
+    WEST: ((-1, -1), (0, -1), (1, -1)),
+    EAST: ((-1, 1), (0, 1), (1, 1)),
+}
+
+# all neighbours, bit i of an elf's neighbours code is set if NEIGHBOURS[i] is taken
+# (neighbour_codes relies on this order)
+NEIGHBOURS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if (dy, dx) != (0, 0)]
+
+
+@lru_cache(maxsize=None)
+def proposal_table():
+    """Direction an elf proposes in round d + 4k by neighbours code at [d, code]
+
+    0 means it stays in place.
+    """
+    directions = [NORTH, SOUTH, WEST, EAST]
+    table = np.zeros((4, 1 << len(NEIGHBOURS)), dtype=np.int64)
+    for d in range(4):
+        # noone around at code 0 so start from 1
+        for code in range(1, table.shape[1]):
+            for nd in range(4):
+                direction = directions[(d + nd) % 4]
+                if not any(
+                    code >> NEIGHBOURS.index(spot) & 1 for spot in LOOKOUTS[direction]
+                ):
+                    table[d, code] = direction
+                    break
+    return table
+
+
+def neighbour_codes(tiles, width, codes, triples, spare):
+    """Fill codes with NEIGHBOURS bits around every tile of a flat board
+
+    Tiles at the board's edges get junk. triples and spare are
+    scratch arrays of the same size as tiles.
+    """
+    # west, self and east of every tile as 3 bits
+    np.left_shift(tiles[2:], 2, out=triples[1:-1])
+    triples[1:-1] |= tiles[:-2]
+    np.left_shift(tiles[1:-1], 1, out=spare[1:-1])
+    triples[1:-1] |= spare[1:-1]
+    # west and east neighbours are bits 3 and 4
+    np.left_shift(tiles[2:], 4, out=codes[1:-1])
+    np.left_shift(tiles[:-2], 3, out=spare[1:-1])
+    codes[1:-1] |= spare[1:-1]
+    # triples of the row above are bits 0-2 and of the row below bits 5-7
+    codes[width:-width] |= triples[: -2 * width]
+    np.left_shift(triples[2 * width :], 5, out=spare[width:-width])
+    codes[width:-width] |= spare[width:-width]
+
+
+def elves_board(yy, xx, margin=2):
+    """Board cropped to elves' bounding box plus margin, and its origin"""
+    y0, x0 = yy.min() - margin, xx.min() - margin
+    board = np.zeros(
+        (yy.max() - y0 + 1 + margin, xx.max() - x0 + 1 + margin), dtype=np.int8
+    )
+    board[yy - y0, xx - x0] = ELF
+    return board, y0, x0
+
+
+def simulate_vectorized(board, rounds=0, margin=16):
+    """Same as simulate but every round is done with array operations.
+
+    Elves are kept as flat indices into a board cropped to their bounding
+    box plus margin. Every round neighbour_codes shifts the whole board
+    around into a neighbours code for every tile, proposals for the elves'
+    codes come from proposal_table and conflicting moves are dropped with
+    bincount. The board is updated in place and only cropped again
+    when elves could have walked up to its edge.
+    """
+    iter_limit = rounds if rounds > 0 else np.Inf
+    table = proposal_table()
+    # start from the input board, it gets cropped before the first round
+    width = board.shape[1]
+    y0 = x0 = 0
+    elves = np.flatnonzero(board)
+    d = 0
+    iteration = 0
+    rounds_to_crop = 0
+    while iteration < iter_limit:
+        if rounds_to_crop == 0:
+            yy, xx = np.divmod(elves, width)
+            yy, xx = yy + y0, xx + x0
+            occupied, y0, x0 = elves_board(yy, xx, margin)
+            width = occupied.shape[1]
+            tiles = occupied.reshape(-1).view(np.uint8)
+            codes, triples, spare = (np.zeros_like(tiles) for _ in range(3))
+            elves = (yy - y0) * width + (xx - x0)
+            steps = np.zeros(max(DELTAS) + 1, dtype=np.int64)
+            for direction, (dy, dx) in DELTAS.items():
+                steps[direction] = dy * width + dx
+            # how far an elf moves along the flat board by round and code
+            moves = steps[table]
+            # elves move at most one tile per round and need a free tile
+            # around them to look at
+            rounds_to_crop = margin - 1
+        rounds_to_crop -= 1
+        iteration += 1
+        neighbour_codes(tiles, width, codes, triples, spare)
+        offsets = moves[d][codes[elves]]
+        targets = elves + offsets
+        # two elves proposing the same tile both stay
+        counts = np.bincount(targets, minlength=tiles.size)
+        moving = (counts[targets] == 1) & (offsets != 0)
+        # switch directions order for the next round
+        d = (d + 1) % 4
+        if not moving.any():
+            break
+        tiles[elves[moving]] = EMPTY
+        targets = targets[moving]
+        tiles[targets] = ELF
+        elves[moving] = targets
+    yy, xx = np.divmod(elves, width)
+    board, _, _ = elves_board(yy, xx, margin=1)
+    return board, iteration
+
+
+def board_to_rows(board):
+    """Every board row as an int where bit x is set if there's an elf at x"""
+    return [
+        int.from_bytes(np.packbits(row > 0, bitorder="little").tobytes(), "little")
+        for row in board
+    ]
+
+
+def rows_to_board(rows):
+    width = max(row.bit_length() for row in rows)
+    n_bytes = (width + 7) // 8
+    board = np.zeros((len(rows), width), dtype=np.int8)
+    for y, row in enumerate(rows):
+        bits = np.frombuffer(row.to_bytes(n_bytes, "little"), dtype=np.uint8)
+        board[y] = np.unpackbits(bits, bitorder="little")[:width] * ELF
+    return board
+
+
+def simulate_bits(board, rounds=0):
+    """Same as simulate but every row of the board is one big int.
+
+    Neighbour checks are shifts and ORs of adjacent rows, so a round takes
+    a few big int operations per row no matter how many elves there are.
+    Moves in perpendicular directions can never collide (the elves would
+    see each other diagonally), so only opposite moves need checking:
+    north and south movers two rows apart, west and east movers two
+    columns apart.
+    """
+    iter_limit = rounds if rounds > 0 else np.Inf
+    rows = board_to_rows(board)
+    directions = [NORTH, SOUTH, WEST, EAST]
+    d = 0
+    iteration = 0
+    while iteration < iter_limit:
+        iteration += 1
+        # keep two empty rows on each side and column 0 empty
+        # so that all neighbours and destinations are in the rows list
+        first = next(y for y, row in enumerate(rows) if row)
+        last = next(y for y in range(len(rows) - 1, -1, -1) if rows[y])
+        rows = [0, 0] + rows[first : last + 1] + [0, 0]
+        combined = 0
+        for row in rows:
+            combined |= row
+        if combined & 1:
+            rows = [row << 64 for row in rows]
+        n = len(rows)
+
+        # propose moving in directions
+        order = [directions[(d + nd) % 4] for nd in range(4)]
+        proposals = {direction: [0] * n for direction in directions}
+        for y in range(2, n - 2):
+            row = rows[y]
+            if row == 0:
+                continue
+            up, down = rows[y - 1], rows[y + 1]
+            column = up | row | down
+            free = {
+                NORTH: ~(up | up << 1 | up >> 1),
+                SOUTH: ~(down | down << 1 | down >> 1),
+                WEST: ~(column << 1),
+                EAST: ~(column >> 1),
+            }
+            # stay in place if noone is around
+            waiting = row & ~(free[NORTH] & free[SOUTH] & free[WEST] & free[EAST])
+            for direction in order:
+                moving = waiting & free[direction]
+                proposals[direction][y] = moving
+                waiting ^= moving
+
+        # move if noone else is moving there
+        north, south = proposals[NORTH], proposals[SOUTH]
+        west, east = proposals[WEST], proposals[EAST]
+        moved = False
+        for y in range(2, n - 2):
+            to_north = north[y] & ~south[y - 2]
+            to_south = south[y] & ~north[y + 2]
+            to_west = west[y] & ~(east[y] << 2)
+            to_east = east[y] & ~(west[y] >> 2)
+            leaving = to_north | to_south | to_west | to_east
+            if leaving == 0:
+                continue
+            moved = True
+            rows[y] ^= leaving
+            rows[y] |= to_west >> 1 | to_east << 1
+            rows[y - 1] |= to_north
+            rows[y + 1] |= to_south
+
+        # switch directions order for the next round
+        d = (d + 1) % 4
+        if not moved:
+            break
+    return rows_to_board(rows), iteration
+
+
+parse = parse_board
+
+
+def part1(board):
+    board, _ = simulate_vectorized(board, rounds=10)
     return count_empty_tiles(board)
 
 
-def part2(text_input):
-    board = parse_board(text_input)
-    board, iteration = simulate(board, rounds=0)
+def part2(board):
+    _, iteration = simulate_vectorized(board, rounds=0)
     return iteration
@@ -2,14 +2,10 @@
 # Problem statement: https://adventofcode.com/2022/day/24
 
 import math
+import time
 import numpy as np
 from pathlib import Path
-from matplotlib import pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.patches import Rectangle
-from matplotlib.collections import PatchCollection
 from collections import namedtuple, defaultdict
-from matplotlib import rcParams
 import heapq
 
 day_title = "Blizzard Basin"
@@ -133,6 +129,80 @@ class Winds:
         return "\n".join(res)
 
 
+class PeriodicWinds:
+    """Same as Winds.is_free but without simulating or caching every turn.
+
+    Blizzards going one way along a row (or column) keep their relative
+    positions, so every row has a bitmask of blizzards going east and one
+    going west and every column has masks for north and south. At any
+    turn these masks are just shifted cyclically, so checking a spot
+    takes four bit lookups and memory only depends on basin size.
+    """
+
+    def __init__(self, blizzards, xmin, xmax, ymin, ymax):
+        self.xmin = xmin
+        self.xmax = xmax
+        self.ymin = ymin
+        self.ymax = ymax
+        self.width = xmax - xmin + 1
+        self.height = ymax - ymin + 1
+        self.period = math.lcm(self.width, self.height)
+        self.east = [0] * self.height
+        self.west = [0] * self.height
+        self.south = [0] * self.width
+        self.north = [0] * self.width
+        # the same as boolean arrays for computing free masks of whole basin
+        self.grids = {
+            direction: np.zeros((self.height, self.width), dtype=bool)
+            for direction in (NORTH, EAST, SOUTH, WEST)
+        }
+        for b in blizzards:
+            x, y = b.x - xmin, b.y - ymin
+            self.grids[b.direction][y, x] = True
+            if b.direction == EAST:
+                self.east[y] |= 1 << x
+            elif b.direction == WEST:
+                self.west[y] |= 1 << x
+            elif b.direction == SOUTH:
+                self.south[x] |= 1 << y
+            elif b.direction == NORTH:
+                self.north[x] |= 1 << y
+        self.entrances = set(((xmax, ymax + 1), (xmin, ymin - 1)))
+        # free mask of the whole board including walls when there are no winds
+        self.no_winds = np.zeros((ymax + 2, xmax + 2), dtype=bool)
+        self.no_winds[ymin : ymax + 1, xmin : xmax + 1] = True
+        for x, y in self.entrances:
+            self.no_winds[y, x] = True
+
+    def is_free(self, pos):
+        x, y = pos.x - self.xmin, pos.y - self.ymin
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return (pos.x, pos.y) in self.entrances
+        # like in Winds free spots at turn t are where blizzards are
+        # after t + 1 moves
+        moves = pos.turn + 1
+        w, h = self.width, self.height
+        return not (
+            (self.east[y] >> ((x - moves) % w)) & 1
+            or (self.west[y] >> ((x + moves) % w)) & 1
+            or (self.south[x] >> ((y - moves) % h)) & 1
+            or (self.north[x] >> ((y + moves) % h)) & 1
+        )
+
+    def free_mask(self, turn):
+        """Boolean array of free spots indexed by [y, x], same turns as is_free"""
+        moves = turn + 1
+        occupied = (
+            np.roll(self.grids[EAST], moves, axis=1)
+            | np.roll(self.grids[WEST], -moves, axis=1)
+            | np.roll(self.grids[SOUTH], moves, axis=0)
+            | np.roll(self.grids[NORTH], -moves, axis=0)
+        )
+        mask = self.no_winds.copy()
+        mask[self.ymin : self.ymax + 1, self.xmin : self.xmax + 1] &= ~occupied
+        return mask
+
+
 SearchPosition = namedtuple("SearchPosition", ["x", "y", "turn"])
 
 
@@ -174,29 +244,174 @@ def find_best_path(winds, source, target, start_turn):
     return best_path
 
 
-def part1(text_input):
-    blizzards, bounds = parse_board(text_input)
+def spread(reach):
+    """Spots reachable from reach in one step or by waiting"""
+    grown = reach.copy()
+    grown[1:, :] |= reach[:-1, :]
+    grown[:-1, :] |= reach[1:, :]
+    grown[:, 1:] |= reach[:, :-1]
+    grown[:, :-1] |= reach[:, 1:]
+    return grown
+
+
+def check_progress(reach, previous, elapsed, source, period):
+    """Reachable spots to compare against when the next blizzard period starts
+
+    If they didn't change over a whole period (or nothing is reachable
+    at all) the search would go on forever, so raise ValueError instead.
+    """
+    if not reach.any():
+        raise ValueError(f"Can't reach anything from {source}")
+    if elapsed % period != 0:
+        return previous
+    if previous is not None and np.array_equal(previous, reach):
+        raise ValueError(f"Can't reach anything new from {source}")
+    return reach
+
+
+def frontier(winds: PeriodicWinds, source, start_turn):
+    """Yields turn and a boolean array of every spot reachable by then.
+
+    Each turn the reachable spots grow by one step in every direction
+    and blizzards cut them down. Raises ValueError when that stops
+    getting anywhere new, so callers can stop at their targets.
+    """
+    reach = np.zeros_like(winds.no_winds)
+    reach[source[1], source[0]] = True
+    turn = start_turn
+    # reachable spots a period ago to notice unreachable targets
+    previous = None
+    while True:
+        yield turn, reach
+        previous = check_progress(
+            reach, previous, turn - start_turn, source, winds.period
+        )
+        turn += 1
+        reach = spread(reach) & winds.free_mask(turn)
+
+
+def frontier_search(winds: PeriodicWinds, source, target, start_turn, route=False):
+    """Earliest turn we can get from source to target starting at start_turn.
+
+    Instead of searching individual positions this follows the frontier
+    of every spot reachable at the current turn.
+    With route=True these arrays are kept to also recover one of the best
+    paths in the same format as find_best_path, otherwise route is None.
+    Raises ValueError if the target can't be reached.
+    """
+    history = []
+    for turn, reach in frontier(winds, source, start_turn):
+        if route:
+            history.append(reach)
+        if reach[target[1], target[0]]:
+            break
+    if not route:
+        return turn, None
+    # walk back from the target through spots reachable a turn earlier
+    x, y = target
+    path = []
+    for reach in reversed(history[:-1]):
+        for direction, (dy, dx) in DELTAS.items():
+            px, py = x - dx, y - dy
+            if 0 <= py < reach.shape[0] and 0 <= px < reach.shape[1] and reach[py, px]:
+                path.append(PATHCHARS[direction])
+                x, y = px, py
+                break
+    return turn, "".join(reversed(path))
+
+
+LegResult = namedtuple(
+    "LegResult", ["source", "target", "start_turn", "arrival", "seconds"]
+)
+
+
+class BasinRouter:
+    """Answers many routing queries in one basin.
+
+    Queries from the same source at the same start turn share a single
+    frontier that runs until all their targets are reached.
+    Free masks are not cached: legs run forward in time one after another,
+    so a mask would only be needed again a whole blizzard period later
+    (600 turns for the task input against 826 turns for all of part 2).
+    Computing them as needed keeps memory independent of the period.
+    """
+
+    def __init__(self, winds: PeriodicWinds):
+        self.winds = winds
+
+    def route_many(self, queries):
+        """Earliest arrivals for (source, target, start_turn) queries.
+
+        Returns a LegResult per query in the same order. Its seconds are
+        the time since its group's search started until the target was
+        reached, so they add up to more than the total time.
+        """
+        groups = {}
+        for i, (source, target, start_turn) in enumerate(queries):
+            groups.setdefault((source, start_turn), []).append((i, target))
+        results = [None] * len(queries)
+        for (source, start_turn), targets in groups.items():
+            t0 = time.perf_counter()
+            for turn, reach in frontier(self.winds, source, start_turn):
+                still_going = []
+                for i, target in targets:
+                    if reach[target[1], target[0]]:
+                        seconds = time.perf_counter() - t0
+                        results[i] = LegResult(
+                            source, target, start_turn, turn, seconds
+                        )
+                    else:
+                        still_going.append((i, target))
+                targets = still_going
+                if len(targets) == 0:
+                    break
+        return results
+
+    def route_legs(self, waypoints, start_turn):
+        """Arrival turns for going through waypoints in order
+
+        Every leg starts when the previous one arrives.
+        """
+        arrivals = []
+        turn = start_turn
+        for source, target in zip(waypoints, waypoints[1:]):
+            (leg,) = self.route_many([(source, target, turn)])
+            turn = leg.arrival
+            arrivals.append(turn)
+        return arrivals
+
+
+parse = parse_board
+
+
+def part1(model):
+    blizzards, bounds = model
     xmin, xmax, ymin, ymax = bounds
-    winds = Winds(blizzards, *bounds)
+    winds = PeriodicWinds(blizzards, *bounds)
     start = (xmin, ymin - 1)
     finish = (xmax, ymax + 1)
-    best_path = find_best_path(winds, start, finish, -1)
-    return len(best_path)
+    arrival, _ = frontier_search(winds, start, finish, -1)
+    return arrival + 1
 
 
-def part2(text_input):
-    blizzards, bounds = parse_board(text_input)
+def part2(model):
+    blizzards, bounds = model
     xmin, xmax, ymin, ymax = bounds
-    winds = Winds(blizzards, *bounds)
+    winds = PeriodicWinds(blizzards, *bounds)
     start = (xmin, ymin - 1)
     finish = (xmax, ymax + 1)
-    there = find_best_path(winds, start, finish, -1)
-    back = find_best_path(winds, finish, start, len(there) - 1)
-    again = find_best_path(winds, start, finish, len(there) + len(back) - 1)
-    return len(there) + len(back) + len(again)
+    router = BasinRouter(winds)
+    arrivals = router.route_legs([start, finish, start, finish], -1)
+    return arrivals[-1] + 1
 
 
 def visualize(text_input):
+    from matplotlib import pyplot as plt
+    import matplotlib.animation as animation
+    from matplotlib.patches import Rectangle
+    from matplotlib.collections import PatchCollection
+    from matplotlib import rcParams
+
     blizzards, bounds = parse_board(text_input)
     xmin, xmax, ymin, ymax = bounds
     width = xmax - xmin + 1
@@ -50,17 +50,25 @@ def decimal_to_snafu(number: int):
     return snafu
 
 
-def part1(text_input):
+def part1_stream(lines):
     total = 0
-    for line in text_input.split("\n"):
+    for line in lines:
         total += snafu_to_decimal(line)
     return decimal_to_snafu(total)
 
 
-def part2(text_input):
+def part2_stream(lines):
     return "no task here"
 
 
+def part1(text_input):
+    return part1_stream(text_input.split("\n"))
+
+
+def part2(text_input):
+    return part2_stream(text_input.split("\n"))
+
+
 def test():
     for sign in [1, -1]:
         for number in range(2000):
@@ -12,9 +12,9 @@ def symbol_score(symbol):
     return s
 
 
-def part1(text_input):
+def part1_stream(lines):
     total = 0
-    for line in text_input.split():
+    for line in lines:
         half_point = len(line) // 2
         first_half = set(line[:half_point])
         second_half = set(line[half_point:])
@@ -23,10 +23,10 @@ def part1(text_input):
     return total
 
 
-def part2(text_input):
+def part2_stream(lines):
     total = 0
     group = []
-    for line in text_input.split():
+    for line in lines:
         group.append(set(line))
         if len(group) == 3:
             common = group[0].intersection(group[1]).intersection(group[2])
@@ -34,3 +34,11 @@ def part2(text_input):
             total += symbol_score(symbol)
             group = []
     return total
+
+
+def part1(text_input):
+    return part1_stream(text_input.split())
+
+
+def part2(text_input):
+    return part2_stream(text_input.split())
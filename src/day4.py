@@ -4,9 +4,9 @@
 day_title = "Camp Cleanup"
 
 
-def part1(text_input):
+def part1_stream(lines):
     total = 0
-    for line in text_input.split("\n"):
+    for line in lines:
         aa, bb = line.split(",")
         a1, a2 = map(int, aa.split("-"))
         b1, b2 = map(int, bb.split("-"))
@@ -15,9 +15,9 @@ def part1(text_input):
     return total
 
 
-def part2(text_input):
+def part2_stream(lines):
     total = 0
-    for line in text_input.split("\n"):
+    for line in lines:
         aa, bb = line.split(",")
         a1, a2 = map(int, aa.split("-"))
         b1, b2 = map(int, bb.split("-"))
@@ -28,3 +28,11 @@ def part2(text_input):
         if x2 >= y1:
             total += 1
     return total
+
+
+def part1(text_input):
+    return part1_stream(text_input.split("\n"))
+
+
+def part2(text_input):
+    return part2_stream(text_input.split("\n"))
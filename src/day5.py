@@ -24,20 +24,25 @@ def parse_moves(moves):
         yield (num, from_stack - 1, to_stack - 1)
 
 
-def part1(text_input):
+def parse(text_input):
     stacks, moves = text_input.split("\n\n")
-    stacks = parse_stacks(stacks)
-    for num, from_stack, to_stack in parse_moves(moves):
+    return parse_stacks(stacks), list(parse_moves(moves))
+
+
+def part1(model):
+    stacks, moves = model
+    stacks = [list(stack) for stack in stacks]
+    for num, from_stack, to_stack in moves:
         for _ in range(num):
             elem = stacks[from_stack].pop()
             stacks[to_stack].append(elem)
     return "".join(stack[-1] for stack in stacks)
 
 
-def part2(text_input):
-    stacks, moves = text_input.split("\n\n")
-    stacks = parse_stacks(stacks)
-    for num, from_stack, to_stack in parse_moves(moves):
+def part2(model):
+    stacks, moves = model
+    stacks = [list(stack) for stack in stacks]
+    for num, from_stack, to_stack in moves:
         elems = [stacks[from_stack].pop() for _ in range(num)]
         stacks[to_stack].extend(reversed(elems))
     return "".join(stack[-1] for stack in stacks)
@@ -3,6 +3,9 @@
 
 day_title = "Tuning Trouble"
 
+# streaming parts get the input file as a read-only mmap
+stream_format = "mmap"
+
 
 def find_marker(text, nunique=4):
     text = text.strip()
@@ -13,6 +16,29 @@ def find_marker(text, nunique=4):
     return -1
 
 
+def find_marker_bytes(buffer, nunique=4):
+    """Same as find_marker but for a bytes-like buffer and in a single pass"""
+    last_seen = [-1] * 256
+    window_start = 0
+    for i, char in enumerate(memoryview(buffer)):
+        if char in b"\r\n":
+            break
+        if last_seen[char] >= window_start:
+            window_start = last_seen[char] + 1
+        last_seen[char] = i
+        if i + 1 - window_start == nunique:
+            return i + 1
+    return -1
+
+
+def part1_stream(buffer):
+    return find_marker_bytes(buffer, nunique=4)
+
+
+def part2_stream(buffer):
+    return find_marker_bytes(buffer, nunique=14)
+
+
 def part1(text_input):
     return find_marker(text_input, nunique=4)
 
@@ -6,10 +6,10 @@ from collections import defaultdict
 day_title = "No Space Left On Device"
 
 
-def directory_sizes(text_input: str):
+def directory_sizes(lines):
     path = []
     sizes = defaultdict(int)
-    for line in text_input.split("\n"):
+    for line in lines:
         line = line.strip()
         # print(line)
         if line.startswith("$ cd"):
@@ -30,16 +30,26 @@ def directory_sizes(text_input: str):
     return sizes
 
 
-def part1(text_input: str):
-    sizes = directory_sizes(text_input)
+def parse(text_input: str):
+    return directory_sizes(text_input.split("\n"))
+
+
+def part1(sizes):
     total = sum(size for size in sizes.values() if size <= 100000)
     return total
 
 
-def part2(text_input):
-    sizes = directory_sizes(text_input)
+def part2(sizes):
     free = 70_000_000 - sizes["/"]
     need = 30_000_000
     delta = need - free
     todelete = min(size for size in sizes.values() if size >= delta)
     return todelete
+
+
+def part1_stream(lines):
+    return part1(directory_sizes(lines))
+
+
+def part2_stream(lines):
+    return part2(directory_sizes(lines))
@@ -3,9 +3,6 @@
 
 from pathlib import Path
 import numpy as np
-from matplotlib import pyplot as plt
-import matplotlib.animation as animation
-from scipy.interpolate import splprep, splev
 
 day_title = "Treetop Tree House"
 
@@ -15,8 +12,10 @@ def parse_heights(text_input: str):
     return heights
 
 
-def part1(text_input: str):
-    trees = parse_heights(text_input)
+parse = parse_heights
+
+
+def part1(trees):
     visible = [[0 for i in row] for row in trees]
     for row in range(len(trees)):
         maxheight = -1
@@ -45,8 +44,7 @@ def part1(text_input: str):
     return sum(sum(v) for v in visible)
 
 
-def part2(text_input):
-    trees = parse_heights(text_input)
+def part2(trees):
     best = 0
     for row in range(1, len(trees) - 1):
         for col in range(1, len(trees[0]) - 1):
@@ -78,6 +76,10 @@ def part2(text_input):
 
 
 def visualize(text_input: str, crop_size=0):
+    from matplotlib import pyplot as plt
+    import matplotlib.animation as animation
+    from scipy.interpolate import splprep, splev
+
     trees = parse_heights(text_input)
     # limit size so that animation doesn't last forever
     if crop_size > 0:
@@ -2,8 +2,6 @@
 # Problem statement: https://adventofcode.com/2022/day/9
 
 from pathlib import Path
-from matplotlib import pyplot as plt
-import matplotlib.animation as animation
 import math
 
 day_title = "Rope Bridge"
@@ -38,39 +36,50 @@ def move_snake(snake, direction):
         snake[part] = move_tail(snake[part - 1], snake[part])
 
 
-def moves_iter(text_input):
-    for line in text_input.split("\n"):
+def moves_iter(lines):
+    for line in lines:
         direction, steps = line.split()
         for _ in range(int(steps)):
             yield direction
 
 
-def part1(text_input):
+def part1_stream(lines):
     visited = set([(0, 0)])
     LENGTH = 2
     snake = [(0, 0) for _ in range(LENGTH)]
-    for direction in moves_iter(text_input):
+    for direction in moves_iter(lines):
         move_snake(snake, direction)
         visited.add(snake[-1])
     return len(visited)
 
 
-def part2(text_input):
+def part2_stream(lines):
     visited = set([(0, 0)])
     LENGTH = 10
     snake = [(0, 0) for _ in range(LENGTH)]
-    for direction in moves_iter(text_input):
+    for direction in moves_iter(lines):
         move_snake(snake, direction)
         visited.add(snake[-1])
     return len(visited)
 
 
+def part1(text_input):
+    return part1_stream(text_input.split("\n"))
+
+
+def part2(text_input):
+    return part2_stream(text_input.split("\n"))
+
+
 def visualize(text_input: str, speedup_every=0):
+    from matplotlib import pyplot as plt
+    import matplotlib.animation as animation
+
     visited_1 = set([(0, 0)])
     visited_2 = set([(0, 0)])
     snake_1 = [(0, 0) for _ in range(2)]
     snake_2 = [(0, 0) for _ in range(10)]
-    moves = list(moves_iter(text_input))
+    moves = list(moves_iter(text_input.split("\n")))
 
     M = len(moves) + 1
 
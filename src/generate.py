@@ -0,0 +1,464 @@
+import itertools
+import math
+import random
+import string
+
+# Generators of synthetic puzzle inputs for scaling experiments.
+# Every generator takes a size (its meaning is given in the docstring)
+# and a random.Random instance and returns input text.
+
+
+def day1(size, rng):
+    """size: number of elves"""
+    elves = []
+    for _ in range(size):
+        items = [str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 10))]
+        elves.append("\n".join(items))
+    return "\n\n".join(elves)
+
+
+def day2(size, rng):
+    """size: number of rounds"""
+    return "\n".join(f"{rng.choice('ABC')} {rng.choice('XYZ')}" for _ in range(size))
+
+
+def day3(size, rng):
+    """size: number of elf groups, three rucksacks each"""
+    lines = []
+    for _ in range(size):
+        letters = list(string.ascii_letters)
+        rng.shuffle(letters)
+        badge, letters = letters[0], letters[1:]
+        for elf in range(3):
+            # every elf gets own letters, so the badge is the only common one
+            pool = letters[17 * elf : 17 * (elf + 1)]
+            shared, first, second = pool[0], pool[1:9], pool[9:]
+            half = rng.randint(4, 16)
+            left = [shared, badge] + rng.choices(first, k=half - 2)
+            right = [shared] + rng.choices(second, k=half - 1)
+            rng.shuffle(left)
+            rng.shuffle(right)
+            lines.append("".join(left + right))
+    return "\n".join(lines)
+
+
+def day4(size, rng):
+    """size: number of elf pairs"""
+    lines = []
+    for _ in range(size):
+        a1, a2 = sorted(rng.randint(1, 99) for _ in range(2))
+        b1, b2 = sorted(rng.randint(1, 99) for _ in range(2))
+        lines.append(f"{a1}-{a2},{b1}-{b2}")
+    return "\n".join(lines)
+
+
+def day5(size, rng):
+    """size: number of moves"""
+    stacks = [
+        [rng.choice(string.ascii_uppercase) for _ in range(rng.randint(1, 8))]
+        for _ in range(9)
+    ]
+    height = max(len(stack) for stack in stacks)
+    lines = []
+    for level in range(height - 1, -1, -1):
+        crates = (f"[{s[level]}]" if len(s) > level else "   " for s in stacks)
+        lines.append(" ".join(crates))
+    lines.append(" " + "   ".join(str(i + 1) for i in range(len(stacks))) + " ")
+    lines.append("")
+    for _ in range(size):
+        # never empty a stack so that every stack has a crate on top in the end
+        source = rng.choice([i for i, stack in enumerate(stacks) if len(stack) > 1])
+        target = rng.choice([i for i in range(len(stacks)) if i != source])
+        num = rng.randint(1, len(stacks[source]) - 1)
+        moved = stacks[source][-num:]
+        del stacks[source][-num:]
+        stacks[target].extend(moved)
+        lines.append(f"move {num} from {source + 1} to {target + 1}")
+    return "\n".join(lines)
+
+
+def day6(size, rng):
+    """size: length of the datastream, markers are near its end"""
+    # three letters can't make a 4-character marker
+    noise = "".join(rng.choices("abc", k=max(0, size - 24)))
+    marker = rng.sample("defghijklmnopqrstuvwxyz", 14)
+    tail = rng.choices(string.ascii_lowercase, k=10)
+    return noise + "".join(marker) + "".join(tail)
+
+
+def day7(size, rng):
+    """size: number of directories"""
+    children = {0: []}
+    for i in range(1, size):
+        # attach to one of the latest directories to get deep trees
+        parent = rng.randint(max(0, i - 3), i - 1)
+        children[parent].append(i)
+        children[i] = []
+    lines = []
+    stack = [(0, False)]
+    while len(stack) > 0:
+        directory, done = stack.pop()
+        if done:
+            lines.append("$ cd ..")
+            continue
+        lines.append("$ cd /" if directory == 0 else f"$ cd d{directory}")
+        lines.append("$ ls")
+        for child in children[directory]:
+            lines.append(f"dir d{child}")
+        for f in range(rng.randint(0, 4)):
+            # log-uniform sizes give a mix of small and large directories
+            lines.append(f"{int(10 ** rng.uniform(3, 5.5))} f{f}.txt")
+        if directory != 0:
+            stack.append((directory, True))
+        for child in reversed(children[directory]):
+            stack.append((child, False))
+    return "\n".join(lines)
+
+
+def day8(size, rng):
+    """size: side of the square forest"""
+    return "\n".join("".join(rng.choices("0123456789", k=size)) for _ in range(size))
+
+
+def day9(size, rng):
+    """size: number of moves"""
+    return "\n".join(f"{rng.choice('RDLU')} {rng.randint(1, 20)}" for _ in range(size))
+
+
+def day10(size, rng):
+    """size: number of instructions, at least 240 cycles are generated"""
+    lines = []
+    cycles = 0
+    while len(lines) < size or cycles < 240:
+        if rng.random() < 0.3:
+            lines.append("noop")
+            cycles += 1
+        else:
+            lines.append(f"addx {rng.randint(-10, 10)}")
+            cycles += 2
+    return "\n".join(lines)
+
+
+def primes():
+    found = []
+    for n in itertools.count(2):
+        if all(n % p != 0 for p in found):
+            found.append(n)
+            yield n
+
+
+def day11(size, rng):
+    """size: number of monkeys (at least 2)"""
+    size = max(2, size)
+    tests = list(itertools.islice(primes(), size))
+    rng.shuffle(tests)
+    squaring_monkey = rng.randrange(size)
+    blocks = []
+    for i in range(size):
+        items = [str(rng.randint(50, 99)) for _ in range(rng.randint(1, 6))]
+        if i == squaring_monkey:
+            operation = "old * old"
+        elif rng.random() < 0.5:
+            operation = f"old * {rng.randint(2, 19)}"
+        else:
+            operation = f"old + {rng.randint(1, 8)}"
+        iftrue, iffalse = rng.sample([j for j in range(size) if j != i] * 2, 2)
+        if iftrue == iffalse:
+            iffalse = next(j for j in range(size) if j not in (i, iftrue))
+        blocks.append(
+            f"Monkey {i}:\n"
+            f"  Starting items: {', '.join(items)}\n"
+            f"  Operation: new = {operation}\n"
+            f"  Test: divisible by {tests[i]}\n"
+            f"    If true: throw to monkey {iftrue}\n"
+            f"    If false: throw to monkey {iffalse}"
+        )
+    return "\n\n".join(blocks)
+
+
+def day12(size, rng):
+    """size: width of the heightmap, height is a quarter of it"""
+    width = max(size, 20)
+    height = max(width // 4, 7)
+    length = width + height - 2
+    rows = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            # a gentle slope from S to E never climbs more than 1 per step
+            h = (x + y) * 25 // length
+            # random pits anywhere except on the top row and right column
+            if y > 0 and x < width - 1 and rng.random() < 0.2:
+                h = rng.randint(0, h)
+            row.append(chr(ord("a") + h))
+        rows.append(row)
+    rows[0][0] = "S"
+    rows[height - 1][width - 1] = "E"
+    return "\n".join("".join(row) for row in rows)
+
+
+def random_packet(rng, depth=0):
+    items = []
+    for _ in range(rng.randint(0, 5)):
+        if depth < 4 and rng.random() < 0.3:
+            items.append(random_packet(rng, depth + 1))
+        else:
+            items.append(rng.randint(0, 10))
+    return items
+
+
+def day13(size, rng):
+    """size: number of packet pairs"""
+    pairs = []
+    for _ in range(size):
+        left = str(random_packet(rng)).replace(" ", "")
+        right = str(random_packet(rng)).replace(" ", "")
+        pairs.append(f"{left}\n{right}")
+    return "\n\n".join(pairs)
+
+
+def day14(size, rng):
+    """size: number of rock paths"""
+    lines = []
+    spread = 20 + size
+    for _ in range(size):
+        x = rng.randint(500 - spread, 500 + spread)
+        y = rng.randint(2, 10 + size)
+        points = [(x, y)]
+        horizontal = rng.random() < 0.5
+        for _ in range(rng.randint(1, 4)):
+            step = rng.randint(1, 8) * rng.choice((-1, 1))
+            if horizontal:
+                x += step
+            else:
+                y = max(2, y + step)
+            points.append((x, y))
+            horizontal = not horizontal
+        lines.append(" -> ".join(f"{x},{y}" for x, y in points))
+    return "\n".join(lines)
+
+
+def day15(size, rng):
+    """size: number of sensors besides the four that leave a single gap"""
+    L = 4000000
+    px, py = rng.randint(0, L), rng.randint(0, L)
+    lines = []
+
+    def add(sx, sy, bx, by):
+        lines.append(f"Sensor at x={sx}, y={sy}: closest beacon is at x={bx}, y={by}")
+
+    # Four far away sensors just barely missing (px, py) on diagonals
+    # together cover everything in the search area except that point
+    D = L + 1
+    for dx, dy in ((-1, -1), (1, -1), (-1, 1), (1, 1)):
+        sx, sy = px + dx * D, py + dy * D
+        add(sx, sy, sx - dx * (2 * D - 1), sy)
+    for _ in range(size):
+        sx, sy = rng.randint(0, L), rng.randint(0, L)
+        reach = abs(sx - px) + abs(sy - py) - 1
+        if reach < 1:
+            continue
+        radius = rng.randint(1, min(reach, L // 4))
+        bx = rng.randint(-radius, radius)
+        by = (radius - abs(bx)) * rng.choice((-1, 1))
+        add(sx, sy, sx + bx, sy + by)
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+def day16(size, rng):
+    """size: number of valves, about 2*log2(size) of them have nonzero flow"""
+    size = max(size, 3)
+    letters = 2 if size <= 26 * 26 else 3
+    labels = [
+        "".join(chars)
+        for chars in itertools.product(string.ascii_uppercase, repeat=letters)
+    ]
+    labels = ["AA"] + rng.sample([label for label in labels if label != "AA"], size - 1)
+    tunnels = {label: set() for label in labels}
+    # random spanning tree plus some extra tunnels keeps the cave connected
+    for i in range(1, size):
+        j = rng.randrange(i)
+        tunnels[labels[i]].add(labels[j])
+        tunnels[labels[j]].add(labels[i])
+    for _ in range(size // 2):
+        a, b = rng.sample(labels, 2)
+        tunnels[a].add(b)
+        tunnels[b].add(a)
+    nonzero = min(size - 1, max(2, int(2 * math.log2(size))))
+    flows = {label: 0 for label in labels}
+    for label in rng.sample(labels[1:], nonzero):
+        flows[label] = rng.randint(1, 25)
+    lines = []
+    for label in labels:
+        others = sorted(tunnels[label])
+        if len(others) == 1:
+            where = f"tunnel leads to valve {others[0]}"
+        else:
+            where = f"tunnels lead to valves {', '.join(others)}"
+        lines.append(f"Valve {label} has flow rate={flows[label]}; {where}")
+    return "\n".join(lines)
+
+
+def day17(size, rng):
+    """size: length of the jet pattern"""
+    return "".join(rng.choices("<>", k=size))
+
+
+def day18(size, rng):
+    """size: number of lava cubes, filling about 30% of a bounding cube"""
+    side = max(3, round((size / 0.3) ** (1 / 3)))
+    cells = rng.sample(range(side**3), min(size, side**3))
+    return "\n".join(
+        f"{c % side},{c // side % side},{c // side // side}" for c in cells
+    )
+
+
+def day19(size, rng):
+    """size: number of blueprints (at least 3)"""
+    lines = []
+    for i in range(1, max(size, 3) + 1):
+        lines.append(
+            f"Blueprint {i}: "
+            f"Each ore robot costs {rng.randint(2, 4)} ore. "
+            f"Each clay robot costs {rng.randint(2, 4)} ore. "
+            f"Each obsidian robot costs {rng.randint(2, 4)} ore "
+            f"and {rng.randint(5, 20)} clay. "
+            f"Each geode robot costs {rng.randint(2, 4)} ore "
+            f"and {rng.randint(5, 20)} obsidian."
+        )
+    return "\n".join(lines)
+
+
+def day20(size, rng):
+    """size: number of encrypted numbers, exactly one of them is zero"""
+    numbers = [rng.choice((-1, 1)) * rng.randint(1, 10000) for _ in range(size - 1)]
+    numbers.insert(rng.randint(0, len(numbers)), 0)
+    return "\n".join(map(str, numbers))
+
+
+def day21(size, rng):
+    """size: number of monkeys, roughly"""
+    names = set(["root", "humn"])
+    lines = []
+    humn_value = None
+
+    def new_name():
+        while True:
+            name = "".join(rng.choices(string.ascii_lowercase, k=4))
+            if name not in names:
+                names.add(name)
+                return name
+
+    # Build expression trees top down so that every monkey yields
+    # a non-negative integer and division is always exact.
+    # humn sits on one side of root and only ever in a numerator
+    # so that the root equation stays linear in humn.
+    def build(value, budget, humn=False):
+        nonlocal humn_value
+        if budget <= 1:
+            if humn:
+                humn_value = value
+                return "humn"
+            name = new_name()
+            lines.append(f"{name}: {value}")
+            return name
+        op = rng.choice("+-*/")
+        if op == "*":
+            divisors = [d for d in range(2, 10) if value > 0 and value % d == 0]
+            if len(divisors) == 0:
+                op = "+"
+            else:
+                b = rng.choice(divisors)
+                a = value // b
+        if op == "/":
+            b = rng.randint(1, 9)
+            a = value * b
+            if a > 10**12:
+                op = "+"
+        if op == "+":
+            a = rng.randint(0, value)
+            b = value - a
+        elif op == "-":
+            b = rng.randint(0, 100)
+            a = value + b
+        left_budget = rng.randint(max(1, budget // 4), max(1, 3 * budget // 4))
+        right_budget = max(1, budget - 1 - left_budget)
+        humn_left = humn and (op == "/" or rng.random() < 0.5)
+        left = build(a, left_budget, humn and humn_left)
+        right = build(b, right_budget, humn and not humn_left)
+        name = new_name()
+        lines.append(f"{name}: {left} {op} {right}")
+        return name
+
+    target = rng.randint(1, 10**6)
+    budget = max(size, 3)
+    left = build(target, budget // 2, humn=True)
+    right = build(target, budget // 2)
+    lines.append(f"root: {left} + {right}")
+    lines.append(f"humn: {humn_value}")
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+def day22(size, rng):
+    """size: side of a cube face, the path has 10*size instructions"""
+    N = max(size, 4)
+    # same cube net layout as in the puzzle input
+    faces = [(0, 1), (0, 2), (1, 1), (2, 0), (2, 1), (3, 0)]
+    board = [[" "] * (3 * N) for _ in range(4 * N)]
+    for fy, fx in faces:
+        for y in range(fy * N, (fy + 1) * N):
+            for x in range(fx * N, (fx + 1) * N):
+                board[y][x] = "#" if rng.random() < 0.1 else "."
+    board[0][N] = "."  # starting tile
+    lines = ["".join(row).rstrip() for row in board]
+    path = [str(rng.randint(1, 2 * N))]
+    for _ in range(10 * N):
+        path.append(rng.choice("LR"))
+        path.append(str(rng.randint(1, 2 * N)))
+    return "\n".join(lines) + "\n\n" + "".join(path)
+
+
+def day23(size, rng):
+    """size: side of the initial square of elves"""
+    return "\n".join(
+        "".join("#" if rng.random() < 0.4 else "." for _ in range(size))
+        for _ in range(size)
+    )
+
+
+def day24(size, rng):
+    """size: width of the basin, height is a quarter of it"""
+    width = max(size, 5)
+    height = max(width // 4, 4)
+    rows = ["#." + "#" * width]
+    for _ in range(height):
+        row = []
+        for x in range(width):
+            if rng.random() < 0.5:
+                row.append(".")
+            elif x in (0, width - 1):
+                # no vertical blizzards in the entrance and exit columns
+                row.append(rng.choice("<>"))
+            else:
+                row.append(rng.choice("<>^v"))
+        rows.append("#" + "".join(row) + "#")
+    rows.append("#" * width + ".#")
+    return "\n".join(rows)
+
+
+def day25(size, rng):
+    """size: number of SNAFU numbers"""
+    from day25 import decimal_to_snafu
+
+    return "\n".join(decimal_to_snafu(rng.randint(1, 10**12)) for _ in range(size))
+
+
+GENERATORS = {day: globals()[f"day{day}"] for day in range(1, 26)}
+
+
+def generate(day, size, seed=0):
+    """Input text for given day, the same for the same size and seed"""
+    rng = random.Random(seed)
+    return GENERATORS[day](size, rng) + "\n"
@@ -0,0 +1,184 @@
+import cProfile
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from runner import part_steps
+
+PROFILE_DIR = Path(__file__).parent.parent / "profiles"
+
+
+class StackSampler:
+    """Sampling profiler for the thread that creates it.
+
+    A background thread looks at the profiled thread's stack every interval
+    seconds and counts identical stacks. Results are written in the folded
+    format ("outer;inner;innermost count" per line) understood by
+    flamegraph.pl, speedscope and similar tools.
+    """
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        # let the sampler grab the GIL about as often as it wants to sample
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(self.interval)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def save(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def profile_day(day, input_path, folder=PROFILE_DIR, top=15, flamegraph=False):
+    """Solve a day under cProfile, saving stats per part into folder.
+
+    Prints answers and top functions by cumulative time. With flamegraph
+    every part is solved once more under the sampling profiler, so that
+    cProfile overhead doesn't distort sampled stacks.
+    """
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    solution = __import__(f"day{day}")
+    print(f"--- Day {day}: {solution.day_title} ---")
+    for part, solve, arg in part_steps(solution, input_path):
+        name = f"day{day}_parse" if part == 0 else f"day{day}_part{part}"
+        profiler = cProfile.Profile()
+        answer = profiler.runcall(solve, arg)
+        profiler.dump_stats(folder / f"{name}.pstats")
+        if part == 0:
+            print(f"Parse: saved {folder / name}.pstats")
+        else:
+            print(f"Part {part}: {answer}, saved {folder / name}.pstats")
+        stats = pstats.Stats(profiler, stream=sys.stdout)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        if flamegraph:
+            with StackSampler() as sampler:
+                solve(arg)
+            sampler.save(folder / f"{name}.folded")
+            print(f"Sampled stacks saved to {folder / name}.folded")
+
+
+def reset_peak_rss():
+    """Reset peak resident set size of this process where the OS allows it"""
+    try:
+        # Linux: writing 5 to clear_refs resets VmHWM
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+
+    # ru_maxrss is in kilobytes on Linux but in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class PeakSnapshots:
+    """Keeps a tracemalloc snapshot taken close to the peak of traced memory.
+
+    A background thread polls traced memory and takes a new snapshot
+    whenever it exceeds the size at the last snapshot by a margin.
+    """
+
+    def __init__(self, interval=0.01, margin=1.1):
+        self.interval = interval
+        self.margin = margin
+        self.snapshot = None
+        self.snapshot_size = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > self.snapshot_size * self.margin:
+                self.snapshot = tracemalloc.take_snapshot()
+                self.snapshot_size = current
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def measure_memory(solve, arg, top=0):
+    """Run solve(arg) twice: once for peak RSS and once under tracemalloc.
+
+    Returns answer, RSS peak growth and traced peak in bytes, and the
+    biggest allocation sites near the traced peak if top > 0.
+    """
+    rss_before = peak_rss() if reset_peak_rss() else None
+    answer = solve(arg)
+    rss_delta = None if rss_before is None else peak_rss() - rss_before
+
+    tracemalloc.start()
+    snapshots = PeakSnapshots()
+    if top > 0:
+        with snapshots:
+            solve(arg)
+    else:
+        solve(arg)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    sites = []
+    if snapshots.snapshot is not None:
+        sites = snapshots.snapshot.statistics("lineno")[:top]
+    return answer, rss_delta, traced_peak, sites
+
+
+def memory_day(day, input_path, top=0):
+    """Report peak memory for each part of a day"""
+    solution = __import__(f"day{day}")
+    print(f"--- Day {day}: {solution.day_title} ---")
+    for part, solve, arg in part_steps(solution, input_path):
+        answer, rss_delta, traced_peak, sites = measure_memory(solve, arg, top=top)
+        label = "Parse:" if part == 0 else f"Part {part}: {answer}"
+        rss = "n/a" if rss_delta is None else f"+{rss_delta / 2**20:.1f} MB"
+        print(f"{label} (traced peak {traced_peak / 2**20:.1f} MB, peak RSS {rss})")
+        for stat in sites:
+            frame = stat.traceback[0]
+            print(
+                f"{stat.size / 2**20:10.1f} MB {stat.count:10} blocks  "
+                f"{Path(frame.filename).name}:{frame.lineno}"
+            )
@@ -0,0 +1,97 @@
+import hashlib
+import mmap
+import time
+from contextlib import contextmanager
+
+
+def read_input(input_path):
+    with open(input_path) as f:
+        return f.read().rstrip()
+
+
+def parse_input(solution, content):
+    """Parse input with the day's parse hook if it has one.
+
+    Days that define parse(text) get the parsed model passed to both parts
+    instead of raw text. Returns the model and parse time in seconds,
+    or the text itself and None for days without the hook.
+    """
+    parse = getattr(solution, "parse", None)
+    if parse is None:
+        return content, None
+    t0 = time.perf_counter()
+    model = parse(content)
+    return model, time.perf_counter() - t0
+
+
+def input_sha256(input_path):
+    sha = hashlib.sha256()
+    with open(input_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def iter_lines(f):
+    """Lines of a file without newlines and without trailing blank lines.
+
+    Same as read_input(path).split("\n") but lazy, except for
+    trailing whitespace of the last line which is not stripped.
+    """
+    blanks = []  # only yield blank lines if something follows them
+    for line in f:
+        line = line.rstrip("\n")
+        if line.strip() == "":
+            blanks.append(line)
+            continue
+        yield from blanks
+        blanks.clear()
+        yield line
+
+
+@contextmanager
+def open_stream(solution, input_path):
+    """Streaming input for days that define part1_stream / part2_stream.
+
+    Gives an iterator over lines by default, or a read-only mmap of the
+    whole file if the day module sets stream_format = "mmap".
+    """
+    if getattr(solution, "stream_format", "lines") == "mmap":
+        with open(input_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                yield buffer
+    else:
+        with open(input_path) as f:
+            yield iter_lines(f)
+
+
+def has_stream(solution, part):
+    return hasattr(solution, f"part{part}_stream")
+
+
+def run_stream(solution, part, input_path):
+    solve = getattr(solution, f"part{part}_stream")
+    with open_stream(solution, input_path) as data:
+        return solve(data)
+
+
+def part_steps(solution, input_path):
+    """Everything that has to run to solve a day, as (part, function, argument).
+
+    Streaming parts take the input path. Other parts take the parsed model,
+    preceded by the parse hook itself as part 0 if the day has one.
+    """
+    steps = []
+    model = None
+    for part, solve in ((1, solution.part1), (2, solution.part2)):
+        if has_stream(solution, part):
+            stream = lambda path, part=part: run_stream(solution, part, path)
+            steps.append((part, stream, input_path))
+            continue
+        if model is None:
+            content = read_input(input_path)
+            model, parse_time = parse_input(solution, content)
+            if parse_time is not None:
+                steps.append((0, solution.parse, content))
+        steps.append((part, solve, model))
+    return steps
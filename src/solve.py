@@ -1,11 +1,29 @@
 import argparse
+import csv
+import sys
 import time
-import pandas as pd
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from bench import bench_day, summarize, print_stats, save_stats
+from bench import measurements, save_baseline, compare_to_baseline
+from bench import print_import_times
+from runner import read_input, parse_input, input_sha256, has_stream, run_stream
+from answer_cache import AnswerCache
+from profiling import profile_day, memory_day, PROFILE_DIR
+from generate import generate
+
+TIME_STATS_PATH = Path(__file__).parent.parent / "outputs" / "time_stats.csv"
+BASELINE_PATH = Path(__file__).parent.parent / "outputs" / "baseline.json"
+
+# parse is the parse hook time in seconds, None for days without one
+# part1 and part2 are (answer, seconds) with seconds None for cached answers
+DayResult = namedtuple("DayResult", ["day", "title", "parse", "part1", "part2"])
 
 
 def init_argparse() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
-        usage="%(prog)s [-d {day}] [--test] [--input {filepath}]",
+        usage="%(prog)s [-d {day}] [--test] [--input {filepath}] [options]",
         description="Solve AdventOfCode2022 puzzles.",
     )
     parser.add_argument(
@@ -19,41 +37,348 @@ def init_argparse() -> argparse.ArgumentParser:
         action="store_true",
     )
     parser.add_argument("-i", "--input", type=str, help="filepath for input file")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="solve days in a pool of this many processes",
+    )
+    parser.add_argument(
+        "-b",
+        "--bench",
+        type=int,
+        metavar="K",
+        help="benchmark mode: time each part K times and report statistics",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="untimed runs of each part before benchmarking",
+    )
+    parser.add_argument(
+        "--bench-output",
+        type=str,
+        help="write benchmark statistics to this .csv or .parquet file",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        nargs="?",
+        const=BASELINE_PATH,
+        metavar="FILE",
+        help="record solve times as the baseline for later comparisons",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs="?",
+        const=BASELINE_PATH,
+        metavar="FILE",
+        help="compare solve times to the baseline, exit with 1 on regressions",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slowdown that counts as a regression (default 0.2)",
+    )
+    parser.add_argument(
+        "--importtime",
+        action="store_true",
+        help="report import time of each day module instead of solving",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always solve instead of reusing cached answers",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="solve under cProfile and save .pstats files per day and part",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=15,
+        metavar="N",
+        help="print this many functions with most cumulative time per part",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=str,
+        default=PROFILE_DIR,
+        help="where to save profiling results",
+    )
+    parser.add_argument(
+        "--flamegraph",
+        action="store_true",
+        help="with --profile also save sampled stacks in folded flamegraph format",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="report peak traced memory and peak RSS growth per part",
+    )
+    parser.add_argument(
+        "--memory-top",
+        type=int,
+        default=0,
+        metavar="N",
+        help="with --memory also list N biggest allocation sites near the peak",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    generator = subparsers.add_parser(
+        "generate",
+        usage="%(prog)s -d {day} -s {size} [--seed {seed}] [-o {filepath}]",
+        description="Generate a synthetic input of given size for a day.",
+    )
+    generator.add_argument("-d", "--day", type=int, required=True)
+    generator.add_argument(
+        "-s",
+        "--size",
+        type=int,
+        required=True,
+        help="input size, its meaning depends on the day",
+    )
+    generator.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="random seed, same seed and size give the same input",
+    )
+    generator.add_argument(
+        "-o", "--output", type=str, help="write input to this file instead of stdout"
+    )
     return parser
 
 
-def run_day(day, input_path):
+def input_path(day, test=False):
+    return f"inputs/day{day}/test.txt" if test else f"inputs/day{day}/task.txt"
+
+
+def print_day(result: DayResult):
+    print(f"--- Day {result.day}: {result.title} ---")
+    if result.parse is not None:
+        print(f"Parse: ({result.parse:.3f} s)")
+    for part, (answer, seconds) in enumerate((result.part1, result.part2), start=1):
+        print_part(part, answer, seconds)
+
+
+def print_part(part, answer, seconds):
+    if seconds is None:
+        print(f"Part {part}: {answer} (cached)")
+    else:
+        print(f"Part {part}: {answer} ({seconds:.3f} s)")
+
+
+def run_day(day, input_path, cache: AnswerCache = None):
     solution = __import__(f"day{day}")
     print(f"--- Day {day}: {solution.day_title} ---")
-    with open(input_path) as f:
-        content = f.read().rstrip()
-    t0 = time.perf_counter()
-    answer1 = solution.part1(content)
-    t1 = time.perf_counter()
-    print(f"Part 1: {answer1} ({t1-t0:.3f} s)")
-    answer2 = solution.part2(content)
-    t2 = time.perf_counter()
-    print(f"Part 2: {answer2} ({t2-t1:.3f} s)")
-    return solution.day_title, (answer1, t1 - t0), (answer2, t2 - t0)
+    if cache is not None:
+        sha256 = input_sha256(input_path)
+    model, parse_time = None, None
+    results = []
+    for part, solve in ((1, solution.part1), (2, solution.part2)):
+        if cache is not None:
+            key = cache.key(solution, day, part, sha256)
+            hit, answer = cache.get(key)
+            if hit:
+                print_part(part, answer, None)
+                results.append((answer, None))
+                continue
+        if has_stream(solution, part):
+            t0 = time.perf_counter()
+            answer = run_stream(solution, part, input_path)
+            seconds = time.perf_counter() - t0
+        else:
+            if model is None:
+                # only read and parse if some part actually needs it
+                model, parse_time = parse_input(solution, read_input(input_path))
+                if parse_time is not None:
+                    print(f"Parse: ({parse_time:.3f} s)")
+            t0 = time.perf_counter()
+            answer = solve(model)
+            seconds = time.perf_counter() - t0
+        print_part(part, answer, seconds)
+        results.append((answer, seconds))
+        if cache is not None:
+            cache.put(key, answer)
+    return solution.day_title, parse_time, *results
+
+
+def historical_times():
+    """Milliseconds per (day, part) from the last recorded full run"""
+    times = {}
+    if not TIME_STATS_PATH.exists():
+        return times
+    with open(TIME_STATS_PATH) as f:
+        for row in csv.DictReader(f):
+            day = int(row["day"])
+            times[(day, 1)] = float(row["part_1_ms"])
+            times[(day, 2)] = float(row["part_2_ms"])
+    return times
+
+
+def solve_day(day, parts, input_path):
+    """Solve given parts of a day in isolation so that it can run in a worker process
+
+    The input is parsed at most once and shared by the parts like in run_day.
+    Returns the title, parse time and {part: (answer, seconds)}.
+    """
+    solution = __import__(f"day{day}")
+    model, parse_time = None, None
+    answers = {}
+    for part in parts:
+        t0 = time.perf_counter()
+        if has_stream(solution, part):
+            answer = run_stream(solution, part, input_path)
+        else:
+            if model is None:
+                model, parse_time = parse_input(solution, read_input(input_path))
+                t0 = time.perf_counter()
+            solve = solution.part1 if part == 1 else solution.part2
+            answer = solve(model)
+        answers[part] = (answer, time.perf_counter() - t0)
+    return solution.day_title, parse_time, answers
+
+
+def run_days_parallel(inputs, jobs, cache: AnswerCache = None):
+    """Solve given days in a process pool, one task per day.
+
+    A day's parts run in the same worker so its input is only parsed once.
+    Days are submitted longest-first according to historical solve times
+    so that the slowest days don't end up waiting at the back of the queue.
+    Cached answers are looked up before submitting anything.
+    Results are printed in day order once everything is done.
+    """
+    times = historical_times()
+    days = sorted(
+        inputs,
+        key=lambda day: times.get((day, 1), 0) + times.get((day, 2), 0),
+        reverse=True,
+    )
+    titles = {}
+    cached = {}
+    keys = {}
+    if cache is not None:
+        for day, path in inputs.items():
+            solution = __import__(f"day{day}")
+            titles[day] = solution.day_title
+            sha256 = input_sha256(path)
+            for part in (1, 2):
+                keys[(day, part)] = cache.key(solution, day, part, sha256)
+                hit, answer = cache.get(keys[(day, part)])
+                if hit:
+                    cached[(day, part)] = (answer, None)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
+        for day in days:
+            parts = [part for part in (1, 2) if (day, part) not in cached]
+            if len(parts) > 0:
+                futures[day] = executor.submit(solve_day, day, parts, inputs[day])
+        results = []
+        for day in inputs:
+            parse_time = None
+            answers = {}
+            if day in futures:
+                titles[day], parse_time, answers = futures[day].result()
+                if cache is not None:
+                    for part, (answer, _) in answers.items():
+                        cache.put(keys[(day, part)], answer)
+            parts = [answers.get(part) or cached[(day, part)] for part in (1, 2)]
+            result = DayResult(day, titles[day], parse_time, *parts)
+            print_day(result)
+            results.append(result)
+    return results
 
 
 if __name__ == "__main__":
     parser = init_argparse()
     args = parser.parse_args()
 
+    if args.command == "generate":
+        text = generate(args.day, args.size, seed=args.seed)
+        if args.output is None:
+            sys.stdout.write(text)
+        else:
+            Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+            with open(args.output, "w") as f:
+                f.write(text)
+        sys.exit(0)
+
+    inputs = {}
     if args.input is not None:
         if args.day is None:
             print("Please set --day {day} if giving an input file")
         else:
-            day_title, *ans_times = run_day(args.day, args.input)
+            inputs[args.day] = args.input
     else:
         if args.day is not None:
             days = [args.day]
         else:
             days = range(1, 26)
         for day in days:
-            if args.test:
-                args.input = f"inputs/day{day}/test.txt"
-            else:
-                args.input = f"inputs/day{day}/task.txt"
-            day_title, *ans_times = run_day(day, args.input)
+            inputs[day] = input_path(day, args.test)
+
+    if args.importtime:
+        print_import_times(inputs)
+        sys.exit(0)
+
+    if args.profile:
+        for day, path in inputs.items():
+            profile_day(
+                day,
+                path,
+                folder=args.profile_dir,
+                top=args.profile_top,
+                flamegraph=args.flamegraph,
+            )
+        sys.exit(0)
+
+    if args.memory:
+        for day, path in inputs.items():
+            memory_day(day, path, top=args.memory_top)
+        sys.exit(0)
+
+    if args.bench is not None:
+        records = []
+        for day, path in inputs.items():
+            records.extend(bench_day(day, path, repeats=args.bench, warmup=args.warmup))
+        stats = summarize(records)
+        print_stats(stats)
+        if args.bench_output is not None:
+            save_stats(stats, args.bench_output)
+        timings = {(row.day, row.part): row.median for row in stats.itertuples()}
+    else:
+        # cached answers come with no timings so don't use them for baselines
+        use_cache = not (
+            args.no_cache or args.compare is not None or args.save_baseline is not None
+        )
+        cache = AnswerCache() if use_cache else None
+        if args.jobs > 1:
+            results = run_days_parallel(inputs, args.jobs, cache=cache)
+        else:
+            results = [
+                DayResult(day, *run_day(day, path, cache=cache))
+                for day, path in inputs.items()
+            ]
+        if cache is not None:
+            print(cache.stats_str())
+        timings = {}
+        for result in results:
+            if result.parse is not None:
+                timings[(result.day, 0)] = result.parse
+            timings[(result.day, 1)] = result.part1[1]
+            timings[(result.day, 2)] = result.part2[1]
+
+    if args.compare is not None:
+        print("--- Comparison with baseline ---")
+        regressions = compare_to_baseline(
+            args.compare, measurements(inputs, timings), threshold=args.threshold
+        )
+        if len(regressions) > 0:
+            print(f"{len(regressions)} part(s) got slower than the baseline")
+            sys.exit(1)
+    if args.save_baseline is not None:
+        save_baseline(args.save_baseline, measurements(inputs, timings))
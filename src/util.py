@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from typing import List
 
 
@@ -157,3 +158,118 @@ class Segment2D:
             )
             # leftover should be equal to other now, no need for it any more
         return result
+
+
+class LRUSet:
+    """Set holding at most capacity items, least recently used ones are dropped
+
+    Meant for caches of seen search states: forgetting a state can only
+    cause some repeated work but keeps memory bounded.
+    Capacity None means no limit.
+    """
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, item) -> bool:
+        if item in self.items:
+            self.items.move_to_end(item)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, item):
+        self.items[item] = None
+        self.items.move_to_end(item)
+        if self.capacity is not None and len(self.items) > self.capacity:
+            self.items.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self.items)
+
+    def __str__(self):
+        return (
+            f"{len(self)} items, {self.hits} hits, "
+            f"{self.misses} misses, {self.evictions} evictions"
+        )
+
+
+class CycleDetector:
+    """Finds where a deterministic simulation starts repeating itself.
+
+    Call update(key, value) after every step, where key identifies the
+    state of the simulation and value is some measure that grows by the
+    same gain every cycle (like the height of a tower). A cycle is only
+    reported once the last two periods match key by key with the same gain.
+    Then length, offset (first step of the repeating part), latency
+    (steps simulated from offset until detection) and gain are set and
+    extrapolate tells the value at any later step. Steps count from 0.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.values = []
+        self.last_seen = {}
+        self.length = None
+        self.offset = None
+        self.latency = None
+        self.gain = None
+        self._candidate = None  # (length, gain) of the period being checked
+        self._matched = 0  # steps in a row that repeat the candidate period
+
+    def update(self, key, value) -> bool:
+        """Record the next step, return True once a cycle is confirmed"""
+        step = len(self.keys)
+        self.keys.append(key)
+        self.values.append(value)
+        previous = self.last_seen.get(key)
+        self.last_seen[key] = step
+        if previous is None:
+            self._candidate = None
+            self._matched = 0
+            return False
+        candidate = (step - previous, value - self.values[previous])
+        if candidate == self._candidate:
+            self._matched += 1
+        else:
+            self._candidate = candidate
+            self._matched = 1
+        length, gain = candidate
+        if self._matched < length:
+            return False
+        # the last two periods match, look how far back the cycle goes
+        offset = step - 2 * length + 1
+        while (
+            offset > 0
+            and self.keys[offset - 1] == self.keys[offset - 1 + length]
+            and self.values[offset - 1 + length] - self.values[offset - 1] == gain
+        ):
+            offset -= 1
+        self.length = length
+        self.gain = gain
+        self.offset = offset
+        self.latency = step - offset
+        return True
+
+    def extrapolate(self, step: int):
+        """Value at a step, which can be far beyond the simulated ones"""
+        if step < len(self.values):
+            return self.values[step]
+        if self.length is None:
+            raise ValueError(f"No cycle found yet, can't tell value at step {step}")
+        cycles, remainder = divmod(step - self.offset, self.length)
+        return self.values[self.offset + remainder] + cycles * self.gain
+
+    def __str__(self):
+        if self.length is None:
+            return f"no cycle in {len(self.keys)} steps"
+        return (
+            f"cycle of {self.length} steps from step {self.offset}, "
+            f"detected {self.latency} steps later, gain {self.gain} per cycle"
+        )